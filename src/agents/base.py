@@ -1,25 +1,37 @@
-from typing import Any, Optional, Dict
+from typing import Any, Callable, Optional, Dict, List
 from datetime import datetime
 import asyncio
-from enum import Enum
+import time
+import threading
+from collections import deque
+from enum import IntEnum
 import logging
 from abc import ABC, abstractmethod
+import orjson
 
 from src.utils.memory import AgentMemory
 from src.utils.llm import LLMInterface
 from src.utils.config import Config
+from src.utils.message_queue import SPSCAsyncQueue
 
 logger = logging.getLogger(__name__)
 
-class AgentRole(Enum):
-    RESEARCHER = "researcher"
-    WRITER = "writer"
-    EDITOR = "editor"
-    SEO = "seo"
-    IMAGE = "image"
-    PUBLISHER = "publisher"
+class AgentRole(IntEnum):
+    RESEARCHER = 0
+    WRITER = 1
+    EDITOR = 2
+    SEO = 3
+    IMAGE = 4
+    PUBLISHER = 5
+
+# Role names indexed by AgentRole; used wherever a role is serialized
+ROLE_NAMES = ("researcher", "writer", "editor", "seo", "image", "publisher")
+ROLE_BY_NAME = {name: AgentRole(index) for index, name in enumerate(ROLE_NAMES)}
 
 class Message:
+    _pool: deque = deque(maxlen=4096)
+    _pool_lock = threading.Lock()
+
     def __init__(
         self,
         sender: Optional[AgentRole],
@@ -31,19 +43,64 @@ class Message:
         self.receiver = receiver
         self.content = content
         self.message_type = message_type
-        self.timestamp = datetime.now()
+        self.receiver_idx = int(receiver) if receiver is not None else None
+        self.timestamp_ns = time.time_ns()
+        self._timestamp: Optional[datetime] = None
         self.id = self._generate_id()
 
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a datetime, materialized on first access."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromtimestamp(self.timestamp_ns / 1e9)
+        return self._timestamp
+
+    @classmethod
+    def acquire(
+        cls,
+        sender: Optional[AgentRole],
+        receiver: AgentRole,
+        content: Any,
+        message_type: str = "task"
+    ) -> "Message":
+        """Get a message from the pool, allocating a new one if it is empty."""
+        with cls._pool_lock:
+            message = cls._pool.pop() if cls._pool else None
+        if message is None:
+            return cls(sender, receiver, content, message_type)
+        message.__init__(sender, receiver, content, message_type)
+        return message
+
+    def release(self) -> None:
+        """Clear the message and return it to the pool for reuse."""
+        self.sender = None
+        self.receiver = None
+        self.receiver_idx = None
+        self.content = None
+        self._timestamp = None
+        with self._pool_lock:
+            self._pool.append(self)
+
+    @classmethod
+    def prefill_pool(cls, size: int) -> None:
+        """Pre-allocate pooled messages up to the given size."""
+        with cls._pool_lock:
+            missing = min(size, cls._pool.maxlen) - len(cls._pool)
+            for _ in range(missing):
+                cls._pool.append(cls.__new__(cls))
+
     def _generate_id(self) -> str:
         """Generate unique message ID."""
-        return f"{self.timestamp.timestamp()}-{self.sender}-{self.receiver}"
+        sender = ROLE_NAMES[self.sender] if self.sender is not None else "N"
+        receiver = ROLE_NAMES[self.receiver] if self.receiver is not None else "N"
+        return f"{self.timestamp_ns}-{sender}-{receiver}"
 
     def to_dict(self) -> Dict:
         """Convert message to dictionary for storage."""
         return {
             "id": self.id,
-            "sender": self.sender.value if self.sender else None,
-            "receiver": self.receiver.value,
+            "sender": ROLE_NAMES[self.sender] if self.sender is not None else None,
+            "receiver": ROLE_NAMES[self.receiver] if self.receiver is not None else None,
             "content": self.content,
             "message_type": self.message_type,
             "timestamp": self.timestamp.isoformat()
@@ -53,12 +110,21 @@ class Message:
     def from_dict(cls, data: Dict) -> "Message":
         """Create message from dictionary."""
         return cls(
-            sender=AgentRole(data["sender"]) if data["sender"] else None,
-            receiver=AgentRole(data["receiver"]),
+            sender=ROLE_BY_NAME[data["sender"]] if data["sender"] else None,
+            receiver=ROLE_BY_NAME[data["receiver"]] if data["receiver"] else None,
             content=data["content"],
             message_type=data["message_type"]
         )
 
+    def to_bytes(self) -> bytes:
+        """Serialize message to JSON bytes."""
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_SERIALIZE_DATACLASS)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Message":
+        """Create message from JSON bytes."""
+        return cls.from_dict(orjson.loads(data))
+
 class BaseAgent(ABC):
     def __init__(
         self,
@@ -69,12 +135,20 @@ class BaseAgent(ABC):
         self.role = role
         self.config = config
         self.llm = llm or LLMInterface(config)
-        self.message_queue: asyncio.Queue = asyncio.Queue()
-        self.memory = AgentMemory(role, config)
+        self.message_queue = SPSCAsyncQueue()
+        self._llm_sem = asyncio.Semaphore(config.get("llm.max_concurrency", 8))
+        self.memory = AgentMemory(ROLE_NAMES[role], config)
         self.running = True
-        self.agent_registry = {}
+        self.agent_registry: List[Optional["BaseAgent"]] = [None] * len(AgentRole)
+        # Receives messages addressed to no agent, i.e. final results and
+        # errors for the pipeline itself
+        self.result_callback: Optional[Callable[[Message], None]] = None
+        # Optional shared store (a pipeline ContentStore) for payloads
+        # passed between agents by reference
+        self.content_store = None
+        Message.prefill_pool(config.get("messaging.pool_size", 1024))
         
-        logger.info(f"Initialized {role.value} agent")
+        logger.info(f"Initialized {ROLE_NAMES[role]} agent")
 
     async def process_message(self, message: Message) -> Optional[Message]:
         """Process incoming message and generate response."""
@@ -113,35 +187,88 @@ class BaseAgent(ABC):
             return None
         return None
 
+    async def _attach_shared(
+        self,
+        content: Dict[str, Any],
+        key: str,
+        value: Any
+    ) -> None:
+        """Add a payload to outgoing message content.
+
+        With a content store and a pipeline id, the payload is stored once
+        and the message carries only a ``<key>_ref``; otherwise it is inlined.
+        """
+        pipeline_id = content.get("pipeline_id")
+        if self.content_store is None or pipeline_id is None:
+            content[key] = value
+            return
+        await self.content_store.put(pipeline_id, key, value)
+        content[f"{key}_ref"] = key
+
+    async def _resolve_shared(
+        self,
+        content: Dict[str, Any],
+        key: str,
+        default: Any = None
+    ) -> Any:
+        """Get a payload from message content, inline or by reference."""
+        if key in content:
+            return content[key]
+        ref = content.get(f"{key}_ref")
+        if ref is None or self.content_store is None:
+            return default
+        return await self.content_store.get(content.get("pipeline_id"), ref, default)
+
     def _create_error_message(self, original_message: Message, error: str) -> Message:
         """Create error response message."""
-        return Message(
+        content = {
+            "error": error,
+            "original_message_id": original_message.id
+        }
+        # Carry the pipeline along so the failure reaches the right run
+        if isinstance(original_message.content, dict) and "pipeline_id" in original_message.content:
+            content["pipeline_id"] = original_message.content["pipeline_id"]
+        return Message.acquire(
             sender=self.role,
             receiver=original_message.sender,
-            content={
-                "error": error,
-                "original_message_id": original_message.id
-            },
+            content=content,
             message_type="error"
         )
 
     async def run(self):
         """Main agent loop."""
-        logger.info(f"Starting {self.role.value} agent")
+        logger.info(f"Starting {ROLE_NAMES[self.role]} agent")
         while self.running:
             try:
                 message = await self.message_queue.get()
                 response = await self.process_message(message)
                 if response:
                     await self.send_message(response)
+                message.release()
                 self.message_queue.task_done()
             except Exception as e:
                 logger.error(f"Error in agent loop: {e}")
                 continue
 
+    def register_agents(self, agents: Dict[AgentRole, "BaseAgent"]) -> None:
+        """Register the agents this agent can send messages to."""
+        self.agent_registry = [None] * len(AgentRole)
+        for role, agent in agents.items():
+            self.agent_registry[role] = agent
+
     async def send_message(self, message: Message):
         """Send message to target agent."""
-        target_agent = self.agent_registry.get(message.receiver)
+        if self.result_callback is not None and (
+            message.receiver_idx is None
+            # Pipeline errors end the run, whichever stage raised them
+            or (message.message_type == "error" and message.content.get("pipeline_id"))
+        ):
+            self.result_callback(message)
+            return
+        
+        target_agent = None
+        if message.receiver_idx is not None:
+            target_agent = self.agent_registry[message.receiver_idx]
         if target_agent:
             await target_agent.message_queue.put(message)
         else:
@@ -151,4 +278,4 @@ class BaseAgent(ABC):
         """Shutdown the agent."""
         self.running = False
         await self.memory.save()
-        logger.info(f"Shutdown {self.role.value} agent")
+        logger.info(f"Shutdown {ROLE_NAMES[self.role]} agent")
@@ -1,22 +1,41 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
+import asyncio
+from operator import itemgetter
+from collections import defaultdict, deque
 from datetime import datetime
+import numpy as np
 
 from .base import BaseAgent, AgentRole, Message
 from src.utils.grammar import GrammarChecker
 from src.utils.style import StyleChecker
 from src.utils.content import ContentAnalyzer
 from src.utils.config import Config
+from src.utils.cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# Issue locations are (kind, section index) tags, e.g. ("section", 2)
+Location = Tuple[str, Optional[int]]
+TITLE: Location = ("title", None)
+INTRODUCTION: Location = ("introduction", None)
+CONCLUSION: Location = ("conclusion", None)
+
+# Integer severity ranks, stored on issues as "_sev" for sorting
+SEVERITY_RANK = {"high": 3, "medium": 2, "low": 1}
+
 class EditorAgent(BaseAgent):
     def __init__(self, config: Config):
         super().__init__(AgentRole.EDITOR, config)
         self.grammar_checker = GrammarChecker(config)
         self.style_checker = StyleChecker(config)
+        self._style_rules = self.style_checker.get_rules()
+        self._version = config.get("editor.version", "1.0.0")
         self.content_analyzer = ContentAnalyzer()
-        self.edit_history = []
+        self._embedding_cache = LRUCache(config.get("editor.embedding_cache_size", 4096))
+        self._quality_keys = ("grammar", "style", "content", "readability")
+        self._quality_weights = np.array([0.3, 0.2, 0.3, 0.2], dtype=np.float32)
+        self.edit_history = deque(maxlen=config.get("editor.history_max", 1000))
 
     async def _process_task(self, message: Message) -> Optional[Message]:
         """Process editing tasks."""
@@ -27,19 +46,24 @@ class EditorAgent(BaseAgent):
             )
 
         try:
+            research_data = await self._resolve_shared(
+                message.content, "research_data", {}
+            )
             edited_article = await self.edit_article(
                 message.content["draft_article"],
-                message.content.get("research_data", {})
+                research_data
             )
             
-            return Message(
+            content = {
+                "edited_article": edited_article,
+                "pipeline_id": message.content.get("pipeline_id"),
+                "editing_metadata": self._create_editing_metadata(message)
+            }
+            await self._attach_shared(content, "original_research", research_data)
+            return Message.acquire(
                 sender=self.role,
                 receiver=AgentRole.SEO,
-                content={
-                    "edited_article": edited_article,
-                    "original_research": message.content.get("research_data", {}),
-                    "editing_metadata": self._create_editing_metadata(message)
-                }
+                content=content
             )
         except Exception as e:
             logger.error(f"Editing error: {e}")
@@ -47,26 +71,43 @@ class EditorAgent(BaseAgent):
 
     async def edit_article(self, article: Dict, research_data: Dict) -> Dict:
         """Edit and improve the article."""
-        # Create working copy
+        # Create the only working copy; the fix steps below mutate it in
+        # place and share unchanged sections with the original article
         edited_article = article.copy()
+        edited_article["sections"] = list(article["sections"])
         
-        # Perform various checks
-        grammar_issues = await self._check_grammar(edited_article)
-        style_issues = await self._check_style(edited_article)
-        content_issues = await self._analyze_content(edited_article, research_data)
+        # Perform various checks concurrently; they only read the article
+        grammar_issues, style_issues, content_issues = await asyncio.gather(
+            self._check_grammar(edited_article),
+            self._check_style(edited_article),
+            self._analyze_content(edited_article, research_data)
+        )
         
-        # Apply fixes
-        edited_article = await self._fix_grammar(edited_article, grammar_issues)
-        edited_article = await self._fix_style(edited_article, style_issues)
-        edited_article = await self._improve_content(edited_article, content_issues)
+        # Run the fix -> style -> improve stages for each location
+        # concurrently; each stage only touches its own location's text
+        grammar_by_location = self._group_issues_by_section(grammar_issues)
+        style_by_location = self._group_issues_by_section(style_issues)
+        content_by_location = self._group_issues_by_section(content_issues)
+        locations = {*grammar_by_location, *style_by_location, *content_by_location}
+        
+        await asyncio.gather(*(
+            self._edit_location(
+                edited_article,
+                grammar_by_location.get(location, []),
+                style_by_location.get(location, []),
+                content_by_location.get(location, [])
+            )
+            for location in locations
+        ))
         
         # Verify improvements
         quality_score = await self._assess_quality(edited_article)
         
         # Store edit history
+        now_iso = datetime.now().isoformat()
         self.edit_history.append({
             "article_id": article["id"],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "improvements": {
                 "grammar": len(grammar_issues),
                 "style": len(style_issues),
@@ -75,85 +116,83 @@ class EditorAgent(BaseAgent):
             "quality_score": quality_score
         })
 
-        return {
-            **edited_article,
-            "quality_score": quality_score,
-            "edit_metadata": {
-                "grammar_improvements": len(grammar_issues),
-                "style_improvements": len(style_issues),
-                "content_improvements": len(content_issues),
-                "timestamp": datetime.now().isoformat()
-            }
+        edited_article["quality_score"] = quality_score
+        edited_article["edit_metadata"] = {
+            "grammar_improvements": len(grammar_issues),
+            "style_improvements": len(style_issues),
+            "content_improvements": len(content_issues),
+            "timestamp": now_iso
         }
+        
+        return edited_article
+
+    async def _edit_location(
+        self,
+        article: Dict,
+        grammar_issues: List[Dict],
+        style_issues: List[Dict],
+        content_issues: List[Dict]
+    ) -> None:
+        """Apply all fixes for a single location of the article in place."""
+        await self._fix_grammar(article, grammar_issues)
+        await self._fix_style(article, style_issues)
+        await self._improve_content(article, content_issues)
 
     async def _check_grammar(self, article: Dict) -> List[Dict]:
         """Check for grammar issues."""
-        issues = []
-        
-        # Check title
-        title_issues = await self.grammar_checker.check_text(article["title"])
-        issues.extend(self._format_issues("title", title_issues))
-        
-        # Check introduction
-        intro_issues = await self.grammar_checker.check_text(article["introduction"])
-        issues.extend(self._format_issues("introduction", intro_issues))
+        locations = [TITLE, INTRODUCTION]
+        texts = [article["title"], article["introduction"]]
         
         # Check each section
         for i, section in enumerate(article["sections"]):
-            section_issues = await self.grammar_checker.check_text(section["content"])
-            issues.extend(self._format_issues(f"section_{i}", section_issues))
+            locations.append(("section", i))
+            texts.append(section["content"])
         
-        # Check conclusion
-        conclusion_issues = await self.grammar_checker.check_text(article["conclusion"])
-        issues.extend(self._format_issues("conclusion", conclusion_issues))
+        locations.append(CONCLUSION)
+        texts.append(article["conclusion"])
+        
+        # Check all texts in a single batch
+        results = await self.grammar_checker.check_batch(texts)
+        
+        issues = []
+        for location, location_issues in zip(locations, results):
+            issues.extend(self._format_issues(location, location_issues))
         
         return issues
 
     async def _check_style(self, article: Dict) -> List[Dict]:
         """Check for style issues."""
-        style_issues = []
-        
         # Check overall style consistency
-        style_rules = self.style_checker.get_rules()
-        
-        # Check title style
-        title_issues = await self.style_checker.check_text(
-            article["title"],
-            style_rules["title"]
-        )
-        style_issues.extend(self._format_issues("title", title_issues))
-        
-        # Check content style
-        for i, section in enumerate(article["sections"]):
-            section_issues = await self.style_checker.check_text(
-                section["content"],
+        style_rules = self._style_rules
+        
+        # Check title style, content style and tone consistency concurrently;
+        # all section contents share the content rules and go in one batch
+        title_issues, section_results, tone_issues = await asyncio.gather(
+            self.style_checker.check_text(article["title"], style_rules["title"]),
+            self.style_checker.check_batch(
+                [section["content"] for section in article["sections"]],
                 style_rules["content"]
-            )
-            style_issues.extend(self._format_issues(f"section_{i}", section_issues))
+            ),
+            self.style_checker.check_tone_consistency(article)
+        )
         
-        # Check tone consistency
-        tone_issues = await self.style_checker.check_tone_consistency(article)
+        style_issues = self._format_issues(TITLE, title_issues)
+        for i, section_issues in enumerate(section_results):
+            style_issues.extend(self._format_issues(("section", i), section_issues))
         style_issues.extend(tone_issues)
         
         return style_issues
 
     async def _analyze_content(self, article: Dict, research_data: Dict) -> List[Dict]:
         """Analyze content quality and accuracy."""
-        content_issues = []
-        
-        # Check factual accuracy
-        accuracy_issues = await self._check_factual_accuracy(article, research_data)
-        content_issues.extend(accuracy_issues)
-        
-        # Check content flow
-        flow_issues = await self._check_content_flow(article)
-        content_issues.extend(flow_issues)
-        
-        # Check for missing key points
-        missing_points = await self._check_coverage(article, research_data)
-        content_issues.extend(missing_points)
+        # Check factual accuracy, content flow and missing key points
+        accuracy_issues, flow_issues, missing_points = await asyncio.gather(
+            self._check_factual_accuracy(article, research_data),
+            self._check_content_flow(article),
+            self._check_coverage(article, research_data)
+        )
         
-        return content_issues
+        return [*accuracy_issues, *flow_issues, *missing_points]
 
     async def _check_factual_accuracy(self, article: Dict, research_data: Dict) -> List[Dict]:
         """Check if article facts match research data."""
@@ -162,12 +201,23 @@ class EditorAgent(BaseAgent):
         # Extract facts from article
         article_facts = await self.content_analyzer.extract_facts(article)
         
+        # Embed every fact text once up front instead of once per comparison
+        research_facts = [
+            *research_data.get("main_points", []),
+            *research_data.get("statistics", [])
+        ]
+        embeddings = await self._embed_texts([
+            fact["text"] for fact in (*article_facts, *research_facts)
+            if "text" in fact
+        ])
+        
         # Compare with research data
         for fact in article_facts:
-            if not self._verify_fact(fact, research_data):
+            if not self._verify_fact(fact, research_data, embeddings):
                 issues.append({
                     "type": "factual_accuracy",
                     "severity": "high",
+                    "_sev": SEVERITY_RANK["high"],
                     "description": f"Unverified fact: {fact['text']}",
                     "location": fact["location"],
                     "suggestion": "Verify fact against research data or remove"
@@ -175,56 +225,75 @@ class EditorAgent(BaseAgent):
         
         return issues
 
-    def _verify_fact(self, fact: Dict, research_data: Dict) -> bool:
+    async def _embed_texts(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Get normalized embeddings for texts, batching the uncached ones."""
+        embeddings = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            vector = self._embedding_cache.get(text)
+            if vector is None:
+                missing.append(text)
+            else:
+                embeddings[text] = vector
+        
+        if missing:
+            vectors = await self.content_analyzer.embed_batch(missing)
+            for text, vector in zip(missing, vectors):
+                vector = np.asarray(vector, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                embeddings[text] = vector / norm if norm else vector
+                self._embedding_cache.set(text, embeddings[text])
+        
+        return embeddings
+
+    def _verify_fact(
+        self,
+        fact: Dict,
+        research_data: Dict,
+        embeddings: Dict[str, np.ndarray]
+    ) -> bool:
         """Verify a fact against research data."""
         # Check main points
         for point in research_data.get("main_points", []):
-            if self._facts_match(fact, point):
+            if self._facts_match(fact, point, embeddings):
                 return True
         
         # Check statistics
         for stat in research_data.get("statistics", []):
-            if self._facts_match(fact, stat):
+            if self._facts_match(fact, stat, embeddings):
                 return True
         
         return False
 
-    def _facts_match(self, fact1: Dict, fact2: Dict) -> bool:
+    def _facts_match(
+        self,
+        fact1: Dict,
+        fact2: Dict,
+        embeddings: Dict[str, np.ndarray]
+    ) -> bool:
         """Check if two facts match in meaning."""
         # Compare numerical values if present
         if "value" in fact1 and "value" in fact2:
             return abs(fact1["value"] - fact2["value"]) < 0.01
         
-        # Compare textual content
-        return self.content_analyzer.calculate_similarity(
-            fact1["text"],
-            fact2["text"]
-        ) > 0.8
+        # Compare textual content by cosine similarity of the embeddings
+        return float(np.dot(
+            embeddings[fact1["text"]],
+            embeddings[fact2["text"]]
+        )) > 0.8
 
     async def _fix_grammar(self, article: Dict, issues: List[Dict]) -> Dict:
-        """Fix grammar issues in the article."""
-        edited_article = article.copy()
-        
-        for issue in sorted(issues, key=lambda x: x["severity"], reverse=True):
-            if issue["location"] == "title":
-                edited_article["title"] = await self._apply_grammar_fix(
-                    edited_article["title"],
-                    issue
-                )
-            elif issue["location"].startswith("section_"):
-                section_idx = int(issue["location"].split("_")[1])
-                edited_article["sections"][section_idx]["content"] = \
-                    await self._apply_grammar_fix(
-                        edited_article["sections"][section_idx]["content"],
-                        issue
-                    )
-            elif issue["location"] == "conclusion":
-                edited_article["conclusion"] = await self._apply_grammar_fix(
-                    edited_article["conclusion"],
+        """Fix grammar issues in the article in place and return it."""
+        for issue in sorted(issues, key=itemgetter("_sev"), reverse=True):
+            location = issue["location"]
+            if location[0] in ("title", "section", "conclusion"):
+                fixed_text = await self._apply_grammar_fix(
+                    self._get_location_text(article, location),
                     issue
                 )
+                self._set_location_text(article, location, fixed_text)
         
-        return edited_article
+        return article
 
     async def _apply_grammar_fix(self, text: str, issue: Dict) -> str:
         """Apply a grammar fix to text."""
@@ -233,72 +302,78 @@ class EditorAgent(BaseAgent):
         
         # Use LLM to generate fix
         fix_prompt = f"Fix the following grammar issue: {issue['description']}\nText: {text}"
-        fixed_text = await self.llm.generate(fix_prompt)
+        async with self._llm_sem:
+            fixed_text = await self.llm.generate(fix_prompt)
         return fixed_text.strip()
 
     async def _improve_content(self, article: Dict, issues: List[Dict]) -> Dict:
-        """Improve content based on identified issues."""
-        improved_article = article.copy()
-        
+        """Improve content based on identified issues, in place."""
         # Group issues by section
         issues_by_section = self._group_issues_by_section(issues)
         
         # Improve each section
-        for section_id, section_issues in issues_by_section.items():
-            if section_id == "title":
-                improved_article["title"] = await self._improve_section_content(
-                    improved_article["title"],
+        for location, section_issues in issues_by_section.items():
+            if location[0] in ("title", "section"):
+                improved_text = await self._improve_section_content(
+                    self._get_location_text(article, location),
                     section_issues
                 )
-            elif section_id.startswith("section_"):
-                idx = int(section_id.split("_")[1])
-                improved_article["sections"][idx]["content"] = \
-                    await self._improve_section_content(
-                        improved_article["sections"][idx]["content"],
-                        section_issues
-                    )
+                self._set_location_text(article, location, improved_text)
         
-        return improved_article
+        return article
 
     async def _assess_quality(self, article: Dict) -> float:
         """Assess the overall quality of the article."""
-        scores = {
-            "grammar": await self.grammar_checker.get_score(article),
-            "style": await self.style_checker.get_score(article),
-            "content": await self.content_analyzer.get_score(article),
-            "readability": await self._calculate_readability(article)
-        }
-        
-        weights = {
-            "grammar": 0.3,
-            "style": 0.2,
-            "content": 0.3,
-            "readability": 0.2
-        }
+        # Score grammar, style, content and readability concurrently, in
+        # the same order as the precomputed weights
+        scores = await asyncio.gather(
+            self.grammar_checker.get_score(article),
+            self.style_checker.get_score(article),
+            self.content_analyzer.get_score(article),
+            self._calculate_readability(article)
+        )
         
-        return sum(score * weights[category] for category, score in scores.items())
+        return float(np.dot(np.asarray(scores, dtype=np.float32), self._quality_weights))
 
-    def _format_issues(self, location: str, issues: List[Dict]) -> List[Dict]:
+    def _format_issues(self, location: Location, issues: List[Dict]) -> List[Dict]:
         """Format issues with location information."""
         return [{
             **issue,
-            "location": location
+            "location": location,
+            "_sev": SEVERITY_RANK.get(issue.get("severity"), 0)
         } for issue in issues]
 
-    def _group_issues_by_section(self, issues: List[Dict]) -> Dict[str, List[Dict]]:
+    def _group_issues_by_section(self, issues: List[Dict]) -> Dict[Location, List[Dict]]:
         """Group issues by their section location."""
-        grouped = {}
+        grouped = defaultdict(list)
         for issue in issues:
-            location = issue["location"]
-            if location not in grouped:
-                grouped[location] = []
-            grouped[location].append(issue)
+            # Article-wide issues such as tone consistency have no location
+            grouped[issue.get("location")].append(issue)
         return grouped
 
+    def _get_location_text(self, article: Dict, location: Location) -> str:
+        """Get the text an issue location points at."""
+        kind, idx = location
+        if kind == "section":
+            return article["sections"][idx]["content"]
+        return article[kind]
+
+    def _set_location_text(self, article: Dict, location: Location, text: str) -> None:
+        """Replace the text an issue location points at.
+
+        Section dicts may be shared with the original article, so a changed
+        section is replaced with a new dict rather than mutated.
+        """
+        kind, idx = location
+        if kind == "section":
+            article["sections"][idx] = {**article["sections"][idx], "content": text}
+        else:
+            article[kind] = text
+
     def _create_editing_metadata(self, message: Message) -> Dict:
         """Create metadata about the editing process."""
         return {
-            "editor_version": self.config.get("editor.version", "1.0.0"),
+            "editor_version": self._version,
             "timestamp": datetime.now().isoformat(),
             "original_article_id": message.content["draft_article"]["id"]
         }
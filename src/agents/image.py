@@ -1,21 +1,48 @@
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import logging
+from collections import deque
 from datetime import datetime
 import asyncio
 
 from .base import BaseAgent, AgentRole, Message
 from src.utils.image import ImageGenerator, ImageOptimizer, ImageAnalyzer
+from src.utils.cache import LRUCache
 from src.utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+NON_VISUAL_SECTION_TYPES = frozenset({"code", "table", "list"})
+
 class ImageAgent(BaseAgent):
     def __init__(self, config: Config):
         super().__init__(AgentRole.IMAGE, config)
         self.image_generator = ImageGenerator(config)
         self.image_optimizer = ImageOptimizer()
         self.image_analyzer = ImageAnalyzer()
-        self.generation_history = []
+        self._image_sem = asyncio.Semaphore(config.get("image.max_concurrency", 4))
+        
+        # Memoized analyzer and LLM tasks keyed on their text input; callers
+        # arriving while a task is running share it instead of repeating it
+        cache_size = config.get("image.cache_size", 1024)
+        self._visual_elements_cache = LRUCache(cache_size)
+        self._alt_text_cache = LRUCache(cache_size)
+        self._caption_cache = LRUCache(cache_size)
+        self.generation_history = deque(maxlen=config.get("image.history_max", 1000))
+        
+        # Settings read on every image
+        self._style = config.get("image.style", "modern")
+        self._version = config.get("image.version", "1.0.0")
+        self._prompt_templates = {
+            image_type: config.get(f"image.prompts.{image_type}")
+            for image_type in (
+                "featured",
+                "section",
+                "social_twitter",
+                "social_facebook",
+                "social_linkedin",
+                "default"
+            )
+        }
 
     async def _process_task(self, message: Message) -> Optional[Message]:
         """Process image generation tasks."""
@@ -30,11 +57,12 @@ class ImageAgent(BaseAgent):
                 message.content["seo_optimized_article"]
             )
             
-            return Message(
+            return Message.acquire(
                 sender=self.role,
                 receiver=AgentRole.PUBLISHER,
                 content={
                     "article_with_images": article_with_images,
+                    "pipeline_id": message.content.get("pipeline_id"),
                     "image_metadata": self._create_image_metadata()
                 }
             )
@@ -46,23 +74,25 @@ class ImageAgent(BaseAgent):
         """Generate and optimize images for article."""
         enhanced_article = article.copy()
         
-        # Generate featured image
-        featured_image = await self._generate_featured_image(article)
-        enhanced_article["featured_image"] = featured_image
+        # One timestamp for the whole batch of images
+        now = datetime.now()
+        generated_at = now.isoformat()
+        id_stamp = now.strftime("%Y%m%d_%H%M%S")
         
-        # Generate section images
-        enhanced_article["sections"] = await self._generate_section_images(
-            article["sections"]
+        # Generate featured, section and social media images concurrently
+        featured_image, sections, social_images = await asyncio.gather(
+            self._generate_featured_image(article, generated_at, id_stamp),
+            self._generate_section_images(article["sections"], generated_at, id_stamp),
+            self._generate_social_images(article, generated_at, id_stamp)
         )
-        
-        # Generate social media images
-        social_images = await self._generate_social_images(article)
+        enhanced_article["featured_image"] = featured_image
+        enhanced_article["sections"] = sections
         enhanced_article["social_images"] = social_images
         
         # Store generation history
         self.generation_history.append({
             "article_id": article["id"],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": generated_at,
             "generated_images": {
                 "featured": featured_image["id"],
                 "sections": [img["id"] for section in enhanced_article["sections"]
@@ -73,7 +103,12 @@ class ImageAgent(BaseAgent):
         
         return enhanced_article
 
-    async def _generate_featured_image(self, article: Dict) -> Dict:
+    async def _generate_featured_image(
+        self,
+        article: Dict,
+        generated_at: str,
+        id_stamp: str
+    ) -> Dict:
         """Generate featured image for article."""
         prompt = await self._create_image_prompt(
             article["title"],
@@ -81,11 +116,12 @@ class ImageAgent(BaseAgent):
             "featured"
         )
         
-        image = await self.image_generator.generate(
-            prompt,
-            size="large",
-            style=self.config.get("image.style", "modern")
-        )
+        async with self._image_sem:
+            image = await self.image_generator.generate(
+                prompt,
+                size="large",
+                style=self._style
+            )
         
         # Optimize image
         optimized = await self.image_optimizer.optimize(
@@ -95,65 +131,91 @@ class ImageAgent(BaseAgent):
         
         # Add metadata
         image_data = {
-            "id": self._generate_image_id("featured"),
+            "id": self._generate_image_id("featured", id_stamp),
             "original": image,
             "optimized": optimized,
             "alt_text": await self._generate_alt_text(article["title"]),
             "caption": await self._generate_caption(article["title"]),
             "metadata": {
                 "prompt": prompt,
-                "style": self.config.get("image.style", "modern"),
-                "generated_at": datetime.now().isoformat()
+                "style": self._style,
+                "generated_at": generated_at
             }
         }
         
         return image_data
 
-    async def _generate_section_images(self, sections: List[Dict]) -> List[Dict]:
+    async def _generate_section_images(
+        self,
+        sections: List[Dict],
+        generated_at: str,
+        id_stamp: str
+    ) -> List[Dict]:
         """Generate images for each section where appropriate."""
-        enhanced_sections = []
+        # Determine which sections need an image
+        needs_image = await asyncio.gather(
+            *(self._should_add_section_image(section) for section in sections)
+        )
         
-        for section in sections:
-            enhanced_section = section.copy()
-            
-            # Determine if section needs an image
-            if await self._should_add_section_image(section):
-                prompt = await self._create_image_prompt(
-                    section["title"],
-                    section.get("keywords", []),
-                    "section"
-                )
-                
-                image = await self.image_generator.generate(
-                    prompt,
-                    size="medium",
-                    style=self.config.get("image.style", "modern")
-                )
-                
-                # Optimize image
-                optimized = await self.image_optimizer.optimize(
-                    image,
-                    target_formats=["jpg", "webp"]
-                )
-                
-                enhanced_section["images"] = [{
-                    "id": self._generate_image_id("section"),
-                    "original": image,
-                    "optimized": optimized,
-                    "alt_text": await self._generate_alt_text(section["title"]),
-                    "caption": await self._generate_caption(section["title"]),
-                    "metadata": {
-                        "prompt": prompt,
-                        "style": self.config.get("image.style", "modern"),
-                        "generated_at": datetime.now().isoformat()
-                    }
-                }]
-            
-            enhanced_sections.append(enhanced_section)
+        # Sections without images are shared with the input unchanged
+        enhanced_sections = list(sections)
+        
+        # Generate images only for the sections that passed
+        selected = [i for i, needed in enumerate(needs_image) if needed]
+        images = await asyncio.gather(
+            *(self._generate_section_image(sections[i], generated_at, id_stamp)
+              for i in selected)
+        )
+        for i, section_images in zip(selected, images):
+            enhanced_sections[i] = {**sections[i], "images": section_images}
         
         return enhanced_sections
 
-    async def _generate_social_images(self, article: Dict) -> List[Dict]:
+    async def _generate_section_image(
+        self,
+        section: Dict,
+        generated_at: str,
+        id_stamp: str
+    ) -> List[Dict]:
+        """Generate the images for a single section."""
+        prompt = await self._create_image_prompt(
+            section["title"],
+            section.get("keywords", []),
+            "section"
+        )
+        
+        async with self._image_sem:
+            image = await self.image_generator.generate(
+                prompt,
+                size="medium",
+                style=self._style
+            )
+        
+        # Optimize image
+        optimized = await self.image_optimizer.optimize(
+            image,
+            target_formats=["jpg", "webp"]
+        )
+        
+        return [{
+            "id": self._generate_image_id("section", id_stamp),
+            "original": image,
+            "optimized": optimized,
+            "alt_text": await self._generate_alt_text(section["title"]),
+            "caption": await self._generate_caption(section["title"]),
+            "metadata": {
+                "prompt": prompt,
+                "style": self._style,
+                "generated_at": generated_at
+            }
+        }]
+
+    async def _generate_social_images(
+        self,
+        article: Dict,
+        generated_at: str,
+        id_stamp: str
+    ) -> List[Dict]:
         """Generate images optimized for social media platforms."""
         social_image_specs = {
             "twitter": {"width": 1200, "height": 630},
@@ -161,39 +223,49 @@ class ImageAgent(BaseAgent):
             "linkedin": {"width": 1104, "height": 736}
         }
         
-        social_images = []
+        return list(await asyncio.gather(*(
+            self._generate_social_image(article, platform, specs, generated_at, id_stamp)
+            for platform, specs in social_image_specs.items()
+        )))
+
+    async def _generate_social_image(
+        self,
+        article: Dict,
+        platform: str,
+        specs: Dict,
+        generated_at: str,
+        id_stamp: str
+    ) -> Dict:
+        """Generate a single social media image for a platform."""
+        prompt = await self._create_image_prompt(
+            article["title"],
+            article.get("keywords", {}).get("primary", ""),
+            f"social_{platform}"
+        )
         
-        for platform, specs in social_image_specs.items():
-            prompt = await self._create_image_prompt(
-                article["title"],
-                article.get("keywords", {}).get("primary", ""),
-                f"social_{platform}"
-            )
-            
+        async with self._image_sem:
             image = await self.image_generator.generate(
                 prompt,
                 size=specs,
-                style=self.config.get("image.style", "modern")
-            )
-            
-            optimized = await self.image_optimizer.optimize(
-                image,
-                target_formats=["jpg", "webp"]
+                style=self._style
             )
-            
-            social_images.append({
-                "id": self._generate_image_id(f"social_{platform}"),
-                "platform": platform,
-                "original": image,
-                "optimized": optimized,
-                "metadata": {
-                    "prompt": prompt,
-                    "specs": specs,
-                    "generated_at": datetime.now().isoformat()
-                }
-            })
         
-        return social_images
+        optimized = await self.image_optimizer.optimize(
+            image,
+            target_formats=["jpg", "webp"]
+        )
+        
+        return {
+            "id": self._generate_image_id(f"social_{platform}", id_stamp),
+            "platform": platform,
+            "original": image,
+            "optimized": optimized,
+            "metadata": {
+                "prompt": prompt,
+                "specs": specs,
+                "generated_at": generated_at
+            }
+        }
 
     async def _create_image_prompt(
         self,
@@ -202,18 +274,25 @@ class ImageAgent(BaseAgent):
         image_type: str
     ) -> str:
         """Create optimized prompt for image generation."""
-        prompt_template = self.config.get(f"image.prompts.{image_type}")
+        if image_type in self._prompt_templates:
+            prompt_template = self._prompt_templates[image_type]
+        else:
+            prompt_template = self.config.get(f"image.prompts.{image_type}")
         if not prompt_template:
-            prompt_template = self.config.get("image.prompts.default")
+            prompt_template = self._prompt_templates["default"]
         
         # Analyze text for visual elements
-        visual_elements = await self.image_analyzer.extract_visual_elements(text)
+        visual_elements = await self._memoized(
+            self._visual_elements_cache,
+            text,
+            lambda: self.image_analyzer.extract_visual_elements(text)
+        )
         
         # Combine elements into prompt
         prompt = prompt_template.format(
             text=text,
             keywords=keywords,
-            style=self.config.get("image.style", "modern"),
+            style=self._style,
             visual_elements=", ".join(visual_elements)
         )
         
@@ -221,6 +300,10 @@ class ImageAgent(BaseAgent):
 
     async def _should_add_section_image(self, section: Dict) -> bool:
         """Determine if a section should include an image."""
+        # Check section type; cheap checks run before the visual score
+        if section.get("type") in NON_VISUAL_SECTION_TYPES:
+            return False
+        
         # Check content length
         if len(section["content"].split()) < 200:
             return False
@@ -229,35 +312,64 @@ class ImageAgent(BaseAgent):
         visual_score = await self.image_analyzer.calculate_visual_score(
             section["content"]
         )
-        
-        # Check section type
-        if section.get("type") in ["code", "table", "list"]:
-            return False
             
         return visual_score > 0.6
 
     async def _generate_alt_text(self, context: str) -> str:
         """Generate SEO-friendly alt text for images."""
         prompt = f"Generate descriptive alt text for an image about: {context}"
-        alt_text = await self.llm.generate(prompt)
-        return alt_text.strip()
+        return await self._memoized(
+            self._alt_text_cache,
+            context,
+            lambda: self._generate_text(prompt)
+        )
 
     async def _generate_caption(self, context: str) -> str:
         """Generate engaging caption for images."""
         prompt = f"Generate an engaging image caption for: {context}"
-        caption = await self.llm.generate(prompt)
-        return caption.strip()
+        return await self._memoized(
+            self._caption_cache,
+            context,
+            lambda: self._generate_text(prompt)
+        )
+
+    async def _generate_text(self, prompt: str) -> str:
+        """Generate short text for an image with the LLM."""
+        async with self._llm_sem:
+            text = await self.llm.generate(prompt)
+        return text.strip()
+
+    async def _memoized(
+        self,
+        cache: LRUCache,
+        key: str,
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the result for a key, computing it at most once at a time."""
+        task = cache.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            cache.set(key, task)
+        try:
+            # One caller being cancelled must not cancel the shared task
+            return await asyncio.shield(task)
+        except BaseException:
+            # Drop failed or cancelled tasks so a later call retries
+            if task.done() and cache.get(key) is task:
+                cache.pop(key)
+            raise
 
-    def _generate_image_id(self, prefix: str) -> str:
+    def _generate_image_id(self, prefix: str, timestamp: Optional[str] = None) -> str:
         """Generate unique image ID."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"img_{prefix}_{timestamp}"
 
     def _create_image_metadata(self) -> Dict:
         """Create metadata about image generation process."""
         return {
-            "generator_version": self.config.get("image.version", "1.0.0"),
-            "style_used": self.config.get("image.style", "modern"),
+            "generator_version": self._version,
+            "style_used": self._style,
             "timestamp": datetime.now().isoformat(),
             "generated_formats": ["jpg", "webp"],
             "optimization_settings": self.image_optimizer.get_settings()
@@ -1,20 +1,38 @@
 from typing import Dict, List, Optional
 import logging
+import asyncio
+from collections import deque
 from datetime import datetime
 
 from .base import BaseAgent, AgentRole, Message
 from src.utils.publisher import ContentPublisher, QualityChecker, AssetManager
+from src.utils.content import count_words
 from src.utils.config import Config
+from src.utils.registry import shared
 
 logger = logging.getLogger(__name__)
 
+_REQUIRED_CONTENT = ("title", "introduction", "sections", "conclusion")
+_REQUIRED_SEO = {
+    "meta_description": "Missing meta description",
+    "keywords": "Missing keywords",
+    "url_slug": "Missing URL slug"
+}
+
 class PublisherAgent(BaseAgent):
     def __init__(self, config: Config):
         super().__init__(AgentRole.PUBLISHER, config)
-        self.content_publisher = ContentPublisher(config)
-        self.quality_checker = QualityChecker()
-        self.asset_manager = AssetManager(config)
+        self.content_publisher = shared(ContentPublisher, config)
+        self.quality_checker = shared(QualityChecker)
+        self.asset_manager = shared(AssetManager, config)
         self.publish_history = []
+        # Scratch lists reused by the synchronous _check_* methods
+        self._issue_lists = deque(maxlen=config.get("publisher.issue_pool_size", 16))
+        self._platforms = tuple(config.get("publisher.platforms", ["default"]))
+        self._min_quality = config.get("publisher.min_quality_score", 0.8)
+        self._min_word_count = config.get("publisher.min_word_count", 1000)
+        self._image_specs = config.get("publisher.image_specs", {})
+        self._version = config.get("publisher.version", "1.0.0")
 
     async def _process_task(self, message: Message) -> Optional[Message]:
         """Process publishing tasks."""
@@ -25,24 +43,27 @@ class PublisherAgent(BaseAgent):
             )
 
         try:
+            now_iso = datetime.now().isoformat()
             publish_result = await self.publish_content(
-                message.content["article_with_images"]
+                message.content["article_with_images"],
+                now_iso=now_iso
             )
             
             # Create final status message
-            return Message(
+            return Message.acquire(
                 sender=self.role,
                 receiver=None,  # Final stage
                 content={
                     "publish_result": publish_result,
-                    "publish_metadata": self._create_publish_metadata(message)
+                    "pipeline_id": message.content.get("pipeline_id"),
+                    "publish_metadata": self._create_publish_metadata(message, now_iso)
                 }
             )
         except Exception as e:
             logger.error(f"Publishing error: {e}")
             return self._create_error_message(message, str(e))
 
-    async def publish_content(self, article: Dict) -> Dict:
+    async def publish_content(self, article: Dict, now_iso: Optional[str] = None) -> Dict:
         """Publish content across specified platforms."""
         # Final quality check
         quality_report = await self.quality_checker.check_content(article)
@@ -54,27 +75,34 @@ class PublisherAgent(BaseAgent):
         
         # Publish to configured platforms
         publish_results = {}
-        platforms = self.config.get("publisher.platforms", ["default"])
+        platforms = self._platforms
         
-        for platform in platforms:
-            try:
-                result = await self.content_publisher.publish(
+        results = await asyncio.gather(
+            *(
+                self.content_publisher.publish(
                     content=article,
                     assets=assets,
                     platform=platform
                 )
-                publish_results[platform] = result
-            except Exception as e:
-                logger.error(f"Publishing failed for {platform}: {e}")
+                for platform in platforms
+            ),
+            return_exceptions=True
+        )
+        
+        for platform, result in zip(platforms, results):
+            if isinstance(result, Exception):
+                logger.error(f"Publishing failed for {platform}: {result}")
                 publish_results[platform] = {
                     "status": "failed",
-                    "error": str(e)
+                    "error": str(result)
                 }
+            else:
+                publish_results[platform] = result
 
         # Store publish history
         self.publish_history.append({
             "article_id": article["id"],
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso or datetime.now().isoformat(),
             "platforms": platforms,
             "results": publish_results
         })
@@ -87,11 +115,17 @@ class PublisherAgent(BaseAgent):
 
     async def _pre_publish_check(self, article: Dict) -> Dict:
         """Perform final checks before publishing."""
+        content, images, seo, compliance = await asyncio.gather(
+            self._check_content(article),
+            self._check_images(article),
+            self._check_seo(article),
+            self._check_compliance(article)
+        )
         checks = {
-            "content": await self._check_content(article),
-            "images": await self._check_images(article),
-            "seo": await self._check_seo(article),
-            "compliance": await self._check_compliance(article)
+            "content": content,
+            "images": images,
+            "seo": seo,
+            "compliance": compliance
         }
         
         return {
@@ -101,42 +135,44 @@ class PublisherAgent(BaseAgent):
 
     async def _check_content(self, article: Dict) -> Dict:
         """Check content quality and completeness."""
-        issues = []
+        issues = self._acquire_issues()
         
         # Check required fields
-        required_fields = ["title", "introduction", "sections", "conclusion"]
-        for field in required_fields:
-            if field not in article:
-                issues.append(f"Missing required field: {field}")
+        missing = set(_REQUIRED_CONTENT).difference(article.keys())
+        if missing:
+            issues.extend(
+                f"Missing required field: {field}"
+                for field in _REQUIRED_CONTENT if field in missing
+            )
 
         # Check content length
-        min_length = self.config.get("publisher.min_word_count", 1000)
-        word_count = len(" ".join([
-            article["title"],
-            article["introduction"],
-            *[s["content"] for s in article["sections"]],
-            article["conclusion"]
-        ]).split())
+        min_length = self._min_word_count
+        word_count = self._word_count(article)
         
         if word_count < min_length:
             issues.append(f"Content length below minimum: {word_count}/{min_length}")
 
-        return {
-            "passed": len(issues) == 0,
-            "issues": issues
-        }
+        return self._check_result(issues)
+
+    def _word_count(self, article: Dict) -> int:
+        """Count words across the article without joining or splitting it."""
+        return (
+            count_words(article["title"])
+            + count_words(article["introduction"])
+            + sum(count_words(s["content"]) for s in article["sections"])
+            + count_words(article["conclusion"])
+        )
 
     async def _check_images(self, article: Dict) -> Dict:
         """Check image assets."""
-        issues = []
+        issues = self._acquire_issues()
         
         # Check featured image
         if "featured_image" not in article:
             issues.append("Missing featured image")
         
         # Check image optimizations
-        image_specs = self.config.get("publisher.image_specs", {})
-        for platform, specs in image_specs.items():
+        for platform, specs in self._image_specs.items():
             if not self.asset_manager.verify_image_specs(
                 article.get("social_images", []),
                 platform,
@@ -144,29 +180,34 @@ class PublisherAgent(BaseAgent):
             ):
                 issues.append(f"Missing or invalid image for {platform}")
 
-        return {
-            "passed": len(issues) == 0,
-            "issues": issues
-        }
+        return self._check_result(issues)
 
     async def _check_seo(self, article: Dict) -> Dict:
         """Check SEO requirements."""
-        issues = []
+        issues = self._acquire_issues()
         
-        seo_requirements = [
-            ("meta_description", "Missing meta description"),
-            ("keywords", "Missing keywords"),
-            ("url_slug", "Missing URL slug")
-        ]
-        
-        for field, message in seo_requirements:
-            if field not in article:
-                issues.append(message)
+        missing = _REQUIRED_SEO.keys() - article.keys()
+        if missing:
+            issues.extend(
+                message for field, message in _REQUIRED_SEO.items()
+                if field in missing
+            )
 
-        return {
-            "passed": len(issues) == 0,
-            "issues": issues
+        return self._check_result(issues)
+
+    def _acquire_issues(self) -> List[str]:
+        """Take an empty scratch list from the pool."""
+        return self._issue_lists.pop() if self._issue_lists else []
+
+    def _check_result(self, issues: List[str]) -> Dict:
+        """Build a check result and return the scratch list to the pool."""
+        result = {
+            "passed": not issues,
+            "issues": list(issues)
         }
+        issues.clear()
+        self._issue_lists.append(issues)
+        return result
 
     async def _check_compliance(self, article: Dict) -> Dict:
         """Check content compliance."""
@@ -179,8 +220,7 @@ class PublisherAgent(BaseAgent):
 
     def _is_quality_acceptable(self, quality_report: Dict) -> bool:
         """Determine if quality is acceptable for publishing."""
-        min_score = self.config.get("publisher.min_quality_score", 0.8)
-        return quality_report["overall_score"] >= min_score
+        return quality_report["overall_score"] >= self._min_quality
 
     def _extract_published_urls(self, publish_results: Dict) -> Dict:
         """Extract published URLs from results."""
@@ -190,11 +230,11 @@ class PublisherAgent(BaseAgent):
                 urls[platform] = result.get("url")
         return urls
 
-    def _create_publish_metadata(self, message: Message) -> Dict:
+    def _create_publish_metadata(self, message: Message, now_iso: Optional[str] = None) -> Dict:
         """Create metadata about publishing process."""
         return {
-            "publisher_version": self.config.get("publisher.version", "1.0.0"),
-            "timestamp": datetime.now().isoformat(),
-            "platforms": self.config.get("publisher.platforms", ["default"]),
+            "publisher_version": self._version,
+            "timestamp": now_iso or datetime.now().isoformat(),
+            "platforms": self._platforms,
             "original_article_id": message.content["article_with_images"]["id"]
         }
@@ -1,21 +1,42 @@
 from typing import Dict, List, Optional
 import asyncio
 import logging
+import hashlib
 from datetime import datetime
+import numpy as np
+
+try:
+    import blake3
+except ImportError:  # pragma: no cover - optional accelerator
+    blake3 = None
 
 from .base import BaseAgent, AgentRole, Message
-from src.utils.research import SearchAPI, ContentAnalyzer, SourceValidator
+from src.utils.research import SearchAPI, ContentAnalyzer, SourceValidator, SentimentBatcher
+from src.utils.cache import TTLCache
 from src.utils.config import Config
+from src.utils.registry import shared
+from src.utils.slug import slugify
 
 logger = logging.getLogger(__name__)
 
 class ResearchAgent(BaseAgent):
     def __init__(self, config: Config):
         super().__init__(AgentRole.RESEARCHER, config)
-        self.search_api = SearchAPI(config)
-        self.content_analyzer = ContentAnalyzer()
-        self.source_validator = SourceValidator(config)
-        self.research_cache = {}
+        self.search_api = shared(SearchAPI, config)
+        self.content_analyzer = shared(ContentAnalyzer)
+        self.source_validator = shared(SourceValidator, config)
+        self.sentiment_batcher = SentimentBatcher(
+            self.content_analyzer,
+            max_batch_size=config.get("researcher.sentiment_batch_size", 32),
+            max_queue_time=config.get("researcher.sentiment_batch_wait_ms", 20) / 1000
+        )
+        self.research_cache = TTLCache(
+            maxsize=config.get("researcher.cache_max", 1024),
+            ttl=config.get("researcher.cache_ttl_hours", 24) * 3600
+        )
+        self._fetch_sem = asyncio.Semaphore(config.get("researcher.fetch_concurrency", 8))
+        self._max_sources = config.get("researcher.max_sources", 10)
+        self._max_academic_sources = config.get("researcher.max_academic_sources", 5)
 
     async def _process_task(self, message: Message) -> Optional[Message]:
         """Process research tasks."""
@@ -28,13 +49,15 @@ class ResearchAgent(BaseAgent):
         topic = message.content["research_topic"]
         try:
             research_data = await self.gather_research(topic)
-            return Message(
+            content = {
+                "topic": topic,
+                "pipeline_id": message.content.get("pipeline_id")
+            }
+            await self._attach_shared(content, "research_data", research_data)
+            return Message.acquire(
                 sender=self.role,
                 receiver=AgentRole.WRITER,
-                content={
-                    "research_data": research_data,
-                    "topic": topic
-                }
+                content=content
             )
         except Exception as e:
             logger.error(f"Research error: {e}")
@@ -44,9 +67,9 @@ class ResearchAgent(BaseAgent):
         """Gather comprehensive research on a topic."""
         # Check cache first
         cache_key = self._generate_cache_key(topic)
-        if cache_key in self.research_cache:
-            if self._is_cache_valid(self.research_cache[cache_key]):
-                return self.research_cache[cache_key]["data"]
+        cached = self.research_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
         # Perform research tasks in parallel
         tasks = [
@@ -70,10 +93,7 @@ class ResearchAgent(BaseAgent):
         }
 
         # Cache the results
-        self.research_cache[cache_key] = {
-            "data": research_data,
-            "timestamp": datetime.now()
-        }
+        self.research_cache.set(cache_key, research_data)
 
         return research_data
 
@@ -81,54 +101,73 @@ class ResearchAgent(BaseAgent):
         """Extract key points about the topic."""
         search_results = await self.search_api.search(
             topic,
-            max_results=self.config.get("researcher.max_sources", 10)
+            max_results=self._max_sources
         )
         
-        key_points = []
-        for result in search_results:
-            if await self.source_validator.is_reliable(result["url"]):
-                content = await self.search_api.fetch_content(result["url"])
-                points = await self.content_analyzer.extract_key_points(content)
-                key_points.extend(points)
+        # Validate and fetch every result concurrently
+        results = await asyncio.gather(
+            *(self._extract_points_from_result(result) for result in search_results)
+        )
+        key_points = [point for points in results for point in points]
         
         return self._deduplicate_points(key_points)
 
+    async def _extract_points_from_result(self, result: Dict) -> List[Dict]:
+        """Fetch a search result and extract its key points if it is reliable."""
+        async with self._fetch_sem:
+            if not await self.source_validator.is_reliable(result["url"]):
+                return []
+            content = await self.search_api.fetch_content(result["url"])
+            return await self.content_analyzer.extract_key_points(content)
+
+    async def _limited(self, coro):
+        """Await a validation call under the fetch concurrency limit."""
+        async with self._fetch_sem:
+            return await coro
+
     async def find_reliable_sources(self, topic: str) -> List[Dict]:
         """Find reliable sources about the topic."""
         sources = await self.search_api.search_academic(
             topic,
-            max_results=self.config.get("researcher.max_academic_sources", 5)
+            max_results=self._max_academic_sources
         )
         
-        reliable_sources = []
-        for source in sources:
-            if await self.source_validator.is_reliable(source["url"]):
-                reliable_sources.append({
-                    "url": source["url"],
-                    "title": source["title"],
-                    "author": source.get("author"),
-                    "published_date": source.get("published_date"),
-                    "citation_count": source.get("citation_count")
-                })
+        checks = await asyncio.gather(*(
+            self._limited(self.source_validator.is_reliable(source["url"]))
+            for source in sources
+        ))
         
-        return reliable_sources
+        return [
+            {
+                "url": source["url"],
+                "title": source["title"],
+                "author": source.get("author"),
+                "published_date": source.get("published_date"),
+                "citation_count": source.get("citation_count")
+            }
+            for source, reliable in zip(sources, checks)
+            if reliable
+        ]
 
     async def gather_statistics(self, topic: str) -> List[Dict]:
         """Gather relevant statistics about the topic."""
         stats = await self.search_api.search_statistics(topic)
-        validated_stats = []
-        
-        for stat in stats:
-            if await self.source_validator.verify_statistic(stat):
-                validated_stats.append({
-                    "value": stat["value"],
-                    "metric": stat["metric"],
-                    "source": stat["source"],
-                    "year": stat["year"],
-                    "confidence": stat["confidence"]
-                })
+        checks = await asyncio.gather(*(
+            self._limited(self.source_validator.verify_statistic(stat))
+            for stat in stats
+        ))
         
-        return validated_stats
+        return [
+            {
+                "value": stat["value"],
+                "metric": stat["metric"],
+                "source": stat["source"],
+                "year": stat["year"],
+                "confidence": stat["confidence"]
+            }
+            for stat, verified in zip(stats, checks)
+            if verified
+        ]
 
     async def analyze_trends(self, topic: str) -> Dict:
         """Analyze trends related to the topic."""
@@ -144,18 +183,23 @@ class ResearchAgent(BaseAgent):
     async def _analyze_sentiment(self, topic: str) -> Dict:
         """Analyze sentiment around the topic."""
         recent_content = await self.search_api.search_recent(topic, days=30)
-        sentiments = []
+        sentiments = await asyncio.gather(*(
+            self.sentiment_batcher.submit(content)
+            for content in recent_content
+        ))
         
-        for content in recent_content:
-            sentiment = await self.content_analyzer.analyze_sentiment(content)
-            sentiments.append(sentiment)
+        scores = np.fromiter(
+            (s["score"] for s in sentiments),
+            dtype=np.float32,
+            count=len(sentiments)
+        )
         
         return {
-            "overall": sum(s["score"] for s in sentiments) / len(sentiments),
+            "overall": float(scores.mean()) if scores.size else 0.0,
             "distribution": {
-                "positive": len([s for s in sentiments if s["score"] > 0.5]),
-                "neutral": len([s for s in sentiments if 0.3 <= s["score"] <= 0.7]),
-                "negative": len([s for s in sentiments if s["score"] < 0.3])
+                "positive": int((scores > 0.5).sum()),
+                "neutral": int(((scores >= 0.3) & (scores <= 0.7)).sum()),
+                "negative": int((scores < 0.3).sum())
             },
             "key_phrases": await self._extract_sentiment_phrases(sentiments)
         }
@@ -169,27 +213,21 @@ class ResearchAgent(BaseAgent):
 
     def _generate_cache_key(self, topic: str) -> str:
         """Generate cache key for a topic."""
-        return f"{topic.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}"
-
-    def _is_cache_valid(self, cache_entry: Dict) -> bool:
-        """Check if cache entry is still valid."""
-        cache_age = datetime.now() - datetime.fromisoformat(cache_entry["timestamp"])
-        max_age = self.config.get("researcher.cache_ttl_hours", 24)
-        return cache_age.total_seconds() < (max_age * 3600)
+        return f"{slugify(topic)}_{datetime.now().strftime('%Y%m%d')}"
 
     def _deduplicate_points(self, points: List[Dict]) -> List[Dict]:
-        """Remove duplicate key points."""
-        seen = set()
-        unique_points = []
-        
+        """Remove duplicate key points, keeping the first occurrence."""
+        unique_points = {}
         for point in points:
-            point_hash = self._hash_point(point)
-            if point_hash not in seen:
-                seen.add(point_hash)
-                unique_points.append(point)
-        
-        return unique_points
-
-    def _hash_point(self, point: Dict) -> str:
-        """Create a hash for a key point for deduplication."""
-        return f"{point['category']}_{point['content'][:100]}"
+            unique_points.setdefault(self._hash_point(point), point)
+        return list(unique_points.values())
+
+    def _hash_point(self, point: Dict) -> bytes:
+        """Create a digest of a key point's full content for deduplication."""
+        # Sources may leave fields empty or non-string
+        category = str(point.get("category", ""))
+        content = str(point.get("content", ""))
+        data = category.encode() + b"\0" + content.encode()
+        if blake3 is not None:
+            return blake3.blake3(data).digest()
+        return hashlib.blake2b(data, digest_size=16).digest()
@@ -1,19 +1,38 @@
 from typing import Dict, List, Optional
 import logging
+import asyncio
+import hashlib
+import re
+from collections import Counter
 from datetime import datetime
 
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional accelerator
+    ahocorasick = None
+
 from .base import BaseAgent, AgentRole, Message
 from src.utils.seo import KeywordAnalyzer, SEOOptimizer, MetadataGenerator
+from src.utils.cache import LRUCache, TTLCache
 from src.utils.config import Config
+from src.utils.registry import shared
 
 logger = logging.getLogger(__name__)
 
 class SEOAgent(BaseAgent):
     def __init__(self, config: Config):
         super().__init__(AgentRole.SEO, config)
-        self.keyword_analyzer = KeywordAnalyzer(config)
-        self.seo_optimizer = SEOOptimizer(config)
-        self.metadata_generator = MetadataGenerator()
+        self.keyword_analyzer = shared(KeywordAnalyzer, config)
+        self.seo_optimizer = shared(SEOOptimizer, config)
+        self.metadata_generator = shared(MetadataGenerator)
+        self._keyword_automata = LRUCache(config.get("seo.automaton_cache_size", 64))
+        # Keyword and schema results keyed by article content hash
+        cache_size = config.get("seo.result_cache_size", 256)
+        cache_ttl = config.get("seo.result_cache_ttl_hours", 24) * 3600
+        self._kw_cache = TTLCache(cache_size, cache_ttl)
+        self._schema_cache = TTLCache(cache_size, cache_ttl)
 
     async def _process_task(self, message: Message) -> Optional[Message]:
         """Process SEO optimization tasks."""
@@ -28,13 +47,19 @@ class SEOAgent(BaseAgent):
                 message.content["edited_article"]
             )
             
-            return Message(
+            content = {
+                "seo_optimized_article": optimized_article,
+                "pipeline_id": message.content.get("pipeline_id")
+            }
+            await self._attach_shared(
+                content,
+                "original_research",
+                await self._resolve_shared(message.content, "original_research", {})
+            )
+            return Message.acquire(
                 sender=self.role,
                 receiver=AgentRole.IMAGE,
-                content={
-                    "seo_optimized_article": optimized_article,
-                    "original_research": message.content.get("original_research", {})
-                }
+                content=content
             )
         except Exception as e:
             logger.error(f"SEO optimization error: {e}")
@@ -43,10 +68,14 @@ class SEOAgent(BaseAgent):
     async def optimize_article(self, article: Dict) -> Dict:
         """Optimize article for search engines."""
         # Analyze keywords and topics
-        keywords = await self.keyword_analyzer.analyze_content(article)
+        article_hash = self._content_hash(article)
+        keywords = self._kw_cache.get(article_hash)
+        if keywords is None:
+            keywords = await self.keyword_analyzer.analyze_content(article)
+            self._kw_cache.set(article_hash, keywords)
         
-        # Optimize content
-        optimized = await self._optimize_content(article, keywords)
+        # Optimize content on a single copy of the article
+        optimized = await self._optimize_content(article.copy(), keywords)
         
         # Generate SEO metadata
         seo_metadata = await self.metadata_generator.generate(
@@ -54,38 +83,33 @@ class SEOAgent(BaseAgent):
             keywords
         )
         
-        return {
-            **optimized,
-            "seo_metadata": seo_metadata,
-            "keywords": keywords
-        }
+        optimized["seo_metadata"] = seo_metadata
+        optimized["keywords"] = keywords
+        return optimized
 
     async def _optimize_content(self, article: Dict, keywords: Dict) -> Dict:
-        """Apply SEO optimizations to article content."""
-        optimized = article.copy()
-        
-        # Optimize title
-        optimized["title"] = await self.seo_optimizer.optimize_title(
-            article["title"],
-            keywords["primary"]
-        )
-        
-        # Optimize meta description
-        optimized["meta_description"] = await self.seo_optimizer.create_meta_description(
-            article["introduction"],
-            keywords["primary"]
-        )
-        
-        # Optimize headings
-        optimized["sections"] = await self._optimize_sections(
-            article["sections"],
-            keywords
+        """Apply SEO optimizations to article content in place."""
+        # Title, meta description and sections are independent
+        title, meta_description, sections = await asyncio.gather(
+            self.seo_optimizer.optimize_title(
+                article["title"],
+                keywords["primary"]
+            ),
+            self.seo_optimizer.create_meta_description(
+                article["introduction"],
+                keywords["primary"]
+            ),
+            self._optimize_sections(
+                article["sections"],
+                keywords
+            )
         )
+        article["title"] = title
+        article["meta_description"] = meta_description
+        article["sections"] = sections
         
         # Optimize content
-        optimized = await self._optimize_main_content(optimized, keywords)
-        
-        return optimized
+        return await self._optimize_main_content(article, keywords)
 
     async def _optimize_sections(
         self,
@@ -93,46 +117,46 @@ class SEOAgent(BaseAgent):
         keywords: Dict
     ) -> List[Dict]:
         """Optimize section headings and content."""
-        optimized_sections = []
-        
-        for section in sections:
-            optimized_section = section.copy()
-            
-            # Optimize section title
-            optimized_section["title"] = await self.seo_optimizer.optimize_heading(
+        headings = asyncio.gather(*(
+            self.seo_optimizer.optimize_heading(
                 section["title"],
                 keywords["secondary"]
             )
-            
-            # Optimize section content
-            optimized_section["content"] = await self.seo_optimizer.optimize_content(
+            for section in sections
+        ))
+        contents = asyncio.gather(*(
+            self.seo_optimizer.optimize_content(
                 section["content"],
                 keywords["primary"],
                 keywords["secondary"]
             )
-            
-            optimized_sections.append(optimized_section)
+            for section in sections
+        ))
+        titles, bodies = await asyncio.gather(headings, contents)
         
-        return optimized_sections
+        return [
+            {**section, "title": title, "content": content}
+            for section, title, content in zip(sections, titles, bodies)
+        ]
 
     async def _optimize_main_content(self, article: Dict, keywords: Dict) -> Dict:
-        """Optimize main content for keyword density and readability."""
-        optimized = article.copy()
+        """Optimize main content for keyword density and readability in place."""
+        # Add schema markup
+        schema_key = (self._content_hash(article), self._content_hash(keywords))
+        schema = self._schema_cache.get(schema_key)
+        if schema is None:
+            schema = await self.metadata_generator.generate_schema(article, keywords)
+            self._schema_cache.set(schema_key, schema)
         
         # Optimize URL slug
-        optimized["url_slug"] = self.seo_optimizer.generate_slug(
+        article["url_slug"] = self.seo_optimizer.generate_slug(
             article["title"],
             keywords["primary"]
         )
-        
-        # Add schema markup
-        optimized["schema_markup"] = await self.metadata_generator.generate_schema(
-            article,
-            keywords
-        )
+        article["schema_markup"] = schema
         
         # Optimize internal linking
-        optimized = await self.seo_optimizer.optimize_internal_linking(optimized)
+        optimized = await self.seo_optimizer.optimize_internal_linking(article)
         
         # Add structured data
         optimized["structured_data"] = self.metadata_generator.generate_structured_data(
@@ -141,6 +165,11 @@ class SEOAgent(BaseAgent):
         
         return optimized
 
+    def _content_hash(self, data: Dict) -> str:
+        """Stable hash of a JSON-serializable dict's content."""
+        payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
     def _create_seo_report(self, article: Dict, keywords: Dict) -> Dict:
         """Create SEO optimization report."""
         return {
@@ -159,24 +188,51 @@ class SEOAgent(BaseAgent):
 
     def _calculate_keyword_density(self, article: Dict, keywords: Dict) -> Dict:
         """Calculate keyword density in the content."""
-        text = f"{article['title']} {article['introduction']} "
-        text += " ".join(section["content"] for section in article["sections"])
-        text += f" {article['conclusion']}"
-        
+        text = " ".join([
+            article["title"],
+            article["introduction"],
+            *[section["content"] for section in article["sections"]],
+            article["conclusion"]
+        ])
         word_count = len(text.split())
-        densities = {}
+        if not word_count:
+            return {
+                "primary": 0.0,
+                "secondary": {keyword: 0.0 for keyword in keywords["secondary"]}
+            }
         
-        # Calculate for primary keyword
-        primary_count = text.lower().count(keywords["primary"].lower())
-        densities["primary"] = (primary_count / word_count) * 100
+        counts = self._count_keywords(
+            text.lower(),
+            [keywords["primary"], *keywords["secondary"]]
+        )
         
-        # Calculate for secondary keywords
-        densities["secondary"] = {}
-        for keyword in keywords["secondary"]:
-            count = text.lower().count(keyword.lower())
-            densities["secondary"][keyword] = (count / word_count) * 100
-            
-        return densities
+        return {
+            "primary": (counts[keywords["primary"].lower()] / word_count) * 100,
+            "secondary": {
+                keyword: (counts[keyword.lower()] / word_count) * 100
+                for keyword in keywords["secondary"]
+            }
+        }
+
+    def _count_keywords(self, text_lower: str, keywords: List[str]) -> Counter:
+        """Count occurrences of every keyword in a single pass over the text."""
+        words = tuple(sorted({keyword.lower() for keyword in keywords if keyword}))
+        if ahocorasick is None:
+            # Count overlapping matches, as the automaton does
+            return Counter({
+                word: len(re.findall(f"(?={re.escape(word)})", text_lower))
+                for word in words
+            })
+        
+        automaton = self._keyword_automata.get(words)
+        if automaton is None:
+            automaton = ahocorasick.Automaton()
+            for word in words:
+                automaton.add_word(word, word)
+            automaton.make_automaton()
+            self._keyword_automata.set(words, automaton)
+        
+        return Counter(word for _, word in automaton.iter(text_lower))
 
     def _calculate_readability(self, article: Dict) -> float:
         """Calculate content readability score."""
@@ -1,14 +1,22 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
+import asyncio
+import json
+from collections import defaultdict
 from datetime import datetime
 
 from .base import BaseAgent, AgentRole, Message
-from src.utils.content import ContentGenerator, StyleGuide
-from src.utils.templates import TemplateManager
+from src.utils.content import ContentGenerator, StyleGuide, count_words
+from src.utils.templates import TemplateManager, compile_template
+from src.utils.llm import join_prompt_blocks
+from src.utils.slug import slugify
 from src.utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Templates may split their cacheable static body from per-call text with this
+DYNAMIC_MARKER = "{{DYNAMIC}}"
+
 class WriterAgent(BaseAgent):
     def __init__(self, config: Config):
         super().__init__(AgentRole.WRITER, config)
@@ -16,10 +24,14 @@ class WriterAgent(BaseAgent):
         self.style_guide = StyleGuide(config)
         self.template_manager = TemplateManager()
         self.writing_history = []
+        self._style_rules_json: Optional[str] = None
+        self._style_rules_version = None
+        self._static_blocks: Dict[str, Tuple[str, Callable[..., str]]] = {}
 
     async def _process_task(self, message: Message) -> Optional[Message]:
         """Process writing tasks."""
-        if "research_data" not in message.content:
+        research_data = await self._resolve_shared(message.content, "research_data")
+        if research_data is None:
             return self._create_error_message(
                 message,
                 "No research data provided"
@@ -27,18 +39,24 @@ class WriterAgent(BaseAgent):
 
         try:
             article = await self.write_article(
-                message.content["research_data"],
+                research_data,
                 message.content["topic"]
             )
             
-            return Message(
+            content = {
+                "draft_article": article,
+                "pipeline_id": message.content.get("pipeline_id"),
+                "metadata": self._create_metadata(
+                    message,
+                    article.get("metadata", {}).get("timestamp"),
+                    research_data
+                )
+            }
+            await self._attach_shared(content, "research_data", research_data)
+            return Message.acquire(
                 sender=self.role,
                 receiver=AgentRole.EDITOR,
-                content={
-                    "draft_article": article,
-                    "research_data": message.content["research_data"],
-                    "metadata": self._create_metadata(message)
-                }
+                content=content
             )
         except Exception as e:
             logger.error(f"Writing error: {e}")
@@ -46,21 +64,23 @@ class WriterAgent(BaseAgent):
 
     async def write_article(self, research_data: Dict, topic: str) -> Dict:
         """Generate article from research data."""
+        now = datetime.now()
+        
         # Create outline
         outline = await self._create_outline(research_data, topic)
         
         # Generate content for each section
-        sections = []
-        for section in outline:
-            content = await self._write_section(
-                section,
-                research_data,
-                outline
-            )
-            sections.append(content)
+        index = self._index_research(research_data)
+        if self.config.get("writer.mode") == "batch":
+            sections = await self._write_sections_batch(outline, research_data, index)
+        else:
+            sections = list(await asyncio.gather(*(
+                self._write_section(section, research_data, outline, index)
+                for section in outline
+            )))
 
         # Assemble the article
-        article = await self._assemble_article(sections, research_data, topic)
+        article = await self._assemble_article(sections, research_data, topic, now)
         
         # Apply style guide
         article = self.style_guide.apply(article)
@@ -68,7 +88,7 @@ class WriterAgent(BaseAgent):
         # Store in writing history
         self.writing_history.append({
             "topic": topic,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": article["metadata"]["timestamp"],
             "outline": outline,
             "article_id": article["id"]
         })
@@ -82,14 +102,14 @@ class WriterAgent(BaseAgent):
         trends = research_data["trends"]
         
         # Generate outline using LLM
-        outline_prompt = self.template_manager.get_template("outline")
-        outline_prompt = outline_prompt.format(
-            topic=topic,
-            main_points=main_points,
-            trends=trends
-        )
+        outline_prompt = self._render_prompt("outline", {
+            "topic": topic,
+            "main_points": main_points,
+            "trends": trends
+        })
         
-        outline_response = await self.llm.generate(outline_prompt)
+        async with self._llm_sem:
+            outline_response = await self.llm.generate(outline_prompt)
         outline = self.content_generator.parse_outline(outline_response)
         
         return outline
@@ -98,24 +118,63 @@ class WriterAgent(BaseAgent):
         self,
         section: Dict,
         research_data: Dict,
-        outline: List[Dict]
+        outline: List[Dict],
+        index: Optional[Dict[str, Tuple]] = None
     ) -> Dict:
         """Write a single section of the article."""
         # Get relevant research data for section
-        section_data = self._get_section_data(section, research_data)
+        section_data = self._get_section_data(section, research_data, index)
         
         # Generate section content
-        section_prompt = self.template_manager.get_template("section")
-        section_prompt = section_prompt.format(
-            section_title=section["title"],
-            section_type=section["type"],
-            key_points=section_data["key_points"],
-            statistics=section_data["statistics"],
-            style_guide=self.style_guide.get_rules()
+        section_prompt = self._section_prompt(section, section_data)
+        
+        async def generate() -> str:
+            async with self._llm_sem:
+                return await self.llm.generate(section_prompt)
+        
+        content = await self.content_generator.generate_content(
+            join_prompt_blocks(section_prompt),
+            generate
         )
         
-        content = await self.llm.generate(section_prompt)
+        return self._build_section(section, section_data, content)
+
+    async def _write_sections_batch(
+        self,
+        outline: List[Dict],
+        research_data: Dict,
+        index: Optional[Dict[str, Tuple]] = None
+    ) -> List[Dict]:
+        """Write all sections through a single batch generation job."""
+        if index is None:
+            index = self._index_research(research_data)
+        section_data = [
+            self._get_section_data(section, research_data, index)
+            for section in outline
+        ]
+        prompts = [
+            join_prompt_blocks(self._section_prompt(section, data))
+            for section, data in zip(outline, section_data)
+        ]
+        
+        contents = await self.content_generator.generate_batch(prompts)
         
+        return [
+            self._build_section(section, data, content)
+            for section, data, content in zip(outline, section_data, contents)
+        ]
+
+    def _section_prompt(self, section: Dict, section_data: Dict) -> List[Dict]:
+        """Build the prompt blocks for a section."""
+        return self._render_prompt("section", {
+            "section_title": section["title"],
+            "section_type": section["type"],
+            "key_points": section_data["key_points"],
+            "statistics": section_data["statistics"]
+        })
+
+    def _build_section(self, section: Dict, section_data: Dict, content: str) -> Dict:
+        """Combine an outline entry with its generated content."""
         return {
             "title": section["title"],
             "content": content,
@@ -123,71 +182,82 @@ class WriterAgent(BaseAgent):
             "sources": section_data["sources"]
         }
 
-    def _get_section_data(self, section: Dict, research_data: Dict) -> Dict:
-        """Get relevant research data for a section."""
-        section_data = {
-            "key_points": [],
-            "statistics": [],
-            "sources": []
-        }
-        
-        # Filter relevant key points
-        for point in research_data["main_points"]:
-            if self._is_relevant_to_section(point, section):
-                section_data["key_points"].append(point)
+    def _index_research(self, research_data: Dict) -> Dict[str, Tuple]:
+        """Build category and keyword posting lists for each research list.
+
+        Returns ``name -> (items, by_category, by_keyword)`` where the
+        postings hold positions in ``items``.
+        """
+        index = {}
+        for name, source in (
+            ("key_points", "main_points"),
+            ("statistics", "statistics"),
+            ("sources", "sources")
+        ):
+            items = research_data[source]
+            by_category = defaultdict(list)
+            by_keyword = defaultdict(list)
+            for i, item in enumerate(items):
+                by_category[item.get("category")].append(i)
+                for keyword in item.get("keywords", []):
+                    by_keyword[keyword].append(i)
+            index[name] = (items, by_category, by_keyword)
+        return index
+
+    def _get_section_data(
+        self,
+        section: Dict,
+        research_data: Dict,
+        index: Optional[Dict[str, Tuple]] = None
+    ) -> Dict:
+        """Get relevant research data for a section.
+
+        An item is relevant when its category matches the section's or
+        they share a keyword.
+        """
+        if index is None:
+            index = self._index_research(research_data)
         
-        # Filter relevant statistics
-        for stat in research_data["statistics"]:
-            if self._is_relevant_to_section(stat, section):
-                section_data["statistics"].append(stat)
+        section_category = section.get("category")
+        section_keywords = section.get("keywords", [])
         
-        # Add sources
-        section_data["sources"] = [
-            source for source in research_data["sources"]
-            if self._is_relevant_to_section(source, section)
-        ]
+        section_data = {}
+        for name, (items, by_category, by_keyword) in index.items():
+            ids = set(by_category.get(section_category, ()))
+            for keyword in section_keywords:
+                ids.update(by_keyword.get(keyword, ()))
+            section_data[name] = [items[i] for i in sorted(ids)]
         
         return section_data
 
-    def _is_relevant_to_section(self, item: Dict, section: Dict) -> bool:
-        """Check if a research item is relevant to a section."""
-        # Compare keywords and categories
-        item_keywords = set(item.get("keywords", []))
-        section_keywords = set(section.get("keywords", []))
-        
-        # Check direct category match
-        if item.get("category") == section.get("category"):
-            return True
-            
-        # Check keyword overlap
-        keyword_overlap = len(item_keywords & section_keywords)
-        return keyword_overlap > 0
-
     async def _assemble_article(
         self,
         sections: List[Dict],
         research_data: Dict,
-        topic: str
+        topic: str,
+        now: Optional[datetime] = None
     ) -> Dict:
         """Assemble final article from sections."""
-        # Generate title and introduction
-        title = await self._generate_title(topic, research_data)
-        introduction = await self._write_introduction(topic, research_data)
+        now = now or datetime.now()
         
-        # Generate conclusion
-        conclusion = await self._write_conclusion(sections, research_data)
+        # Generate title, introduction and conclusion concurrently
+        title, introduction, conclusion = await asyncio.gather(
+            self._generate_title(topic, research_data),
+            self._write_introduction(topic, research_data),
+            self._write_conclusion(sections, research_data)
+        )
         
         # Assemble metadata
         metadata = {
             "topic": topic,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "research_timestamp": research_data["metadata"]["timestamp"],
-            "word_count": sum(len(s["content"].split()) for s in sections),
+            "word_count": sum(count_words(s["content"]) for s in sections),
             "sources": research_data["sources"]
         }
         
         return {
-            "id": self._generate_article_id(topic),
+            "id": self._generate_article_id(topic, now),
             "title": title,
             "introduction": introduction,
             "sections": sections,
@@ -197,27 +267,83 @@ class WriterAgent(BaseAgent):
 
     async def _generate_title(self, topic: str, research_data: Dict) -> str:
         """Generate engaging article title."""
-        title_prompt = self.template_manager.get_template("title")
-        title_prompt = title_prompt.format(
-            topic=topic,
-            main_points=research_data["main_points"][:3],
-            style_guide=self.style_guide.get_rules()
-        )
+        title_prompt = self._render_prompt("title", {
+            "topic": topic,
+            "main_points": research_data["main_points"][:3]
+        })
         
-        title = await self.llm.generate(title_prompt)
+        async with self._llm_sem:
+            title = await self.llm.generate(title_prompt)
         return title.strip()
 
-    def _create_metadata(self, message: Message) -> Dict:
+    def _render_prompt(self, template_name: str, dynamic_vars: Dict) -> List[Dict]:
+        """Render a template as a cacheable static block plus a dynamic block.
+
+        The static block (the template body before DYNAMIC_MARKER) is
+        identical across calls so providers can serve it from their prompt
+        cache. Templates without the marker render to the dynamic block only.
+        """
+        static, dynamic = self._static_block(template_name)
+        dynamic_block = {"type": "text", "text": dynamic(**dynamic_vars)}
+        if not static:
+            return [dynamic_block]
+        return [
+            {"type": "text", "text": static, "cache_control": {"type": "ephemeral"}},
+            dynamic_block
+        ]
+
+    def _static_block(self, template_name: str) -> Tuple[str, Callable[..., str]]:
+        """Get the pre-rendered static prefix and compiled dynamic tail of a template.
+
+        Style rules are substituted wherever the template places them, up
+        front, leaving only the per-call variables in the dynamic tail.
+        """
+        if self._style_rules_version != self.style_guide.version:
+            self._style_rules_json = None
+            self._static_blocks.clear()
+            self._style_rules_version = self.style_guide.version
+        
+        cached = self._static_blocks.get(template_name)
+        if cached is None:
+            template = self.template_manager.get_template(template_name)
+            static, marker, dynamic = template.partition(DYNAMIC_MARKER)
+            if not marker:
+                static, dynamic = "", template
+            
+            rules = self._style_rules()
+            escaped_rules = rules.replace("{", "{{").replace("}", "}}")
+            prefix = static.format(style_guide=rules) if static else ""
+            dynamic = compile_template(dynamic.replace("{style_guide}", escaped_rules))
+            cached = self._static_blocks[template_name] = (prefix, dynamic)
+        return cached
+
+    def _style_rules(self) -> str:
+        """Style guide rules serialized once per rules version."""
+        if self._style_rules_json is None:
+            self._style_rules_json = json.dumps(
+                self.style_guide.get_rules(),
+                sort_keys=True,
+                default=str
+            )
+        return self._style_rules_json
+
+    def _create_metadata(
+        self,
+        message: Message,
+        writing_timestamp: Optional[str] = None,
+        research_data: Optional[Dict] = None
+    ) -> Dict:
         """Create metadata for the article."""
+        if research_data is None:
+            research_data = message.content["research_data"]
         return {
             "original_topic": message.content["topic"],
-            "research_timestamp": message.content["research_data"]["metadata"]["timestamp"],
-            "writing_timestamp": datetime.now().isoformat(),
+            "research_timestamp": research_data["metadata"]["timestamp"],
+            "writing_timestamp": writing_timestamp or datetime.now().isoformat(),
             "agent_version": self.config.get("writer.version", "1.0.0")
         }
 
-    def _generate_article_id(self, topic: str) -> str:
+    def _generate_article_id(self, topic: str, now: Optional[datetime] = None) -> str:
         """Generate unique article ID."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        topic_slug = topic.lower().replace(" ", "_")
-        return f"article_{topic_slug}_{timestamp}"
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        return f"article_{slugify(topic)}_{timestamp}"
@@ -1,44 +1,74 @@
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime
 
-from ..agents import (
-    AgentRole,
-    Message,
-    ResearchAgent,
-    WriterAgent,
-    EditorAgent,
-    SEOAgent,
-    ImageAgent,
-    PublisherAgent
-)
+from ..agents.base import AgentRole, BaseAgent, ROLE_NAMES, Message
+from ..agents.researcher import ResearchAgent
+from ..agents.writer import WriterAgent
+from ..agents.editor import EditorAgent
+from ..agents.seo import SEOAgent
+from ..agents.image import ImageAgent
+from ..agents.publisher import PublisherAgent
 from ..utils.config import Config
 from ..utils.monitoring import PipelineMonitor
+from ..utils.slug import slugify
+from .store import ContentStore
 
 logger = logging.getLogger(__name__)
 
+_AGENT_CLASSES = {
+    AgentRole.RESEARCHER: ResearchAgent,
+    AgentRole.WRITER: WriterAgent,
+    AgentRole.EDITOR: EditorAgent,
+    AgentRole.SEO: SEOAgent,
+    AgentRole.IMAGE: ImageAgent,
+    AgentRole.PUBLISHER: PublisherAgent
+}
+
+class _LazyAgents(dict):
+    """Role -> agent mapping that builds each agent on first access."""
+
+    def __init__(self, factory: Callable[[AgentRole], BaseAgent]):
+        super().__init__()
+        self._factory = factory
+
+    def __missing__(self, role) -> BaseAgent:
+        role = AgentRole(role)
+        agent = self[role] = self._factory(role)
+        return agent
+
 class ContentPipeline:
     def __init__(self, config: Config):
         self.config = config
         self.monitor = PipelineMonitor(config)
+        self.store = ContentStore()
         
-        # Initialize agents
-        self.agents = {
-            AgentRole.RESEARCHER: ResearchAgent(config),
-            AgentRole.WRITER: WriterAgent(config),
-            AgentRole.EDITOR: EditorAgent(config),
-            AgentRole.SEO: SEOAgent(config),
-            AgentRole.IMAGE: ImageAgent(config),
-            AgentRole.PUBLISHER: PublisherAgent(config)
-        }
-        
-        # Set up agent registry
-        for agent in self.agents.values():
-            agent.agent_registry = self.agents
+        # Agents are built on first use, so their models and clients are
+        # only loaded for stages a pipeline actually reaches
+        self.agents = _LazyAgents(self._create_agent)
         
         self.workflow = self.create_workflow()
         self.pipeline_status = {}
+        # Set when a pipeline completes or fails
+        self._done_events: Dict[str, asyncio.Event] = {}
+        # In-flight pipelines in start order; stages process messages FIFO
+        self._active_pipelines = deque()
+        self._agent_tasks: List[asyncio.Task] = []
+        self._started = False
+
+    def _create_agent(self, role: AgentRole) -> BaseAgent:
+        """Build and wire up the agent for a role."""
+        agent = _AGENT_CLASSES[role](self.config)
+        # Agents address each other through the lazy mapping, so sending to
+        # a stage builds it if needed
+        agent.agent_registry = self.agents
+        agent.result_callback = self._handle_result
+        agent.content_store = self.store
+        if self._started:
+            self._agent_tasks.append(asyncio.create_task(agent.run()))
+        return agent
 
     def create_workflow(self) -> Dict:
         """Create the agent workflow configuration."""
@@ -51,6 +81,17 @@ class ContentPipeline:
             AgentRole.PUBLISHER: []
         }
 
+    async def startup(self) -> None:
+        """Start the long-lived agent loops shared by all pipelines."""
+        if self._started:
+            return
+        self._started = True
+        # Agents built later start their loops as they are created
+        self._agent_tasks = [
+            asyncio.create_task(agent.run())
+            for agent in self.agents.values()
+        ]
+
     async def start_pipeline(
         self,
         topic: str,
@@ -69,6 +110,8 @@ class ContentPipeline:
                 "completed_stages": [],
                 "errors": []
             }
+            self._done_events[pipeline_id] = asyncio.Event()
+            self._active_pipelines.append(pipeline_id)
             
             # Start monitoring
             asyncio.create_task(self.monitor.track_pipeline(pipeline_id))
@@ -85,10 +128,8 @@ class ContentPipeline:
                 }
             )
 
-            # Start all agents
-            agent_tasks = []
-            for agent in self.agents.values():
-                agent_tasks.append(asyncio.create_task(agent.run()))
+            # Start the agents on first use
+            await self.startup()
 
             # Start the pipeline
             await self.agents[AgentRole.RESEARCHER].message_queue.put(initial_message)
@@ -102,24 +143,47 @@ class ContentPipeline:
             logger.error(f"Pipeline error: {e}")
             self.pipeline_status[pipeline_id]["status"] = "failed"
             self.pipeline_status[pipeline_id]["errors"].append(str(e))
+            self._finish_pipeline(pipeline_id)
             raise
 
     async def monitor_pipeline(self, pipeline_id: str):
-        """Monitor pipeline progress."""
-        while True:
-            status = self.pipeline_status[pipeline_id]
-            
-            if status["status"] in ["completed", "failed"]:
-                break
-                
-            # Check if publisher has completed
-            if status["current_stage"] == AgentRole.PUBLISHER and \
-               AgentRole.PUBLISHER in status["completed_stages"]:
+        """Wait until the pipeline completes or fails."""
+        await self._done_events[pipeline_id].wait()
+
+    def _handle_result(self, message: Message) -> None:
+        """Record a final result or pipeline-level error from an agent."""
+        pipeline_id = message.content.get("pipeline_id")
+        # Only guess the pipeline when there is no other it could be
+        if pipeline_id is None and len(self._active_pipelines) == 1:
+            pipeline_id = self._active_pipelines[0]
+        status = self.pipeline_status.get(pipeline_id)
+        if status is None:
+            logger.warning(f"Result for unknown pipeline from {message.sender}")
+            return
+        
+        if message.message_type == "error":
+            status["status"] = "failed"
+            status["errors"].append(message.content.get("error"))
+        else:
+            status["current_stage"] = message.sender
+            status["completed_stages"].append(message.sender)
+            if message.sender == AgentRole.PUBLISHER:
                 status["status"] = "completed"
-                status["end_time"] = datetime.now().isoformat()
-                break
-                
-            await asyncio.sleep(1)
+        
+        if status["status"] in ("completed", "failed"):
+            status["end_time"] = datetime.now().isoformat()
+            self._finish_pipeline(pipeline_id)
+
+    def _finish_pipeline(self, pipeline_id: str) -> None:
+        """Release the pipeline's payloads and wake anyone waiting on it."""
+        try:
+            self._active_pipelines.remove(pipeline_id)
+        except ValueError:
+            pass
+        self.store.drop(pipeline_id)
+        event = self._done_events.get(pipeline_id)
+        if event is not None:
+            event.set()
 
     async def get_pipeline_status(self, pipeline_id: str) -> Dict:
         """Get current pipeline status."""
@@ -139,22 +203,29 @@ class ContentPipeline:
     async def _calculate_stage_durations(self, pipeline_id: str) -> Dict:
         """Calculate duration of each completed stage."""
         events = await self.monitor.get_events(pipeline_id)
-        durations = {}
         
+        # Events are recorded in order; keep each stage's first and last
+        first_events = {}
+        last_events = {}
+        for event in events:
+            first_events.setdefault(event["stage"], event)
+            last_events[event["stage"]] = event
+        
+        durations = {}
         for stage in AgentRole:
-            stage_events = [e for e in events if e["stage"] == stage]
-            if len(stage_events) >= 2:  # Has start and end events
-                start = datetime.fromisoformat(stage_events[0]["timestamp"])
-                end = datetime.fromisoformat(stage_events[-1]["timestamp"])
-                durations[stage.value] = (end - start).total_seconds()
+            first = first_events.get(stage)
+            last = last_events.get(stage)
+            if first is not None and first is not last:  # Has start and end events
+                start = datetime.fromisoformat(first["timestamp"])
+                end = datetime.fromisoformat(last["timestamp"])
+                durations[ROLE_NAMES[stage]] = (end - start).total_seconds()
                 
         return durations
 
     def _generate_pipeline_id(self, topic: str) -> str:
         """Generate unique pipeline ID."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        topic_slug = topic.lower().replace(" ", "_")
-        return f"pipeline_{topic_slug}_{timestamp}"
+        return f"pipeline_{slugify(topic)}_{timestamp}"
 
     async def shutdown(self):
         """Shutdown all agents and cleanup."""
@@ -163,6 +234,15 @@ class ContentPipeline:
             shutdown_tasks.append(agent.shutdown())
         
         await asyncio.gather(*shutdown_tasks)
+        
+        # Agent loops may be blocked waiting for messages
+        for task in self._agent_tasks:
+            task.cancel()
+        await asyncio.gather(*self._agent_tasks, return_exceptions=True)
+        self._agent_tasks = []
+        self._started = False
+        
+        await self.config.close_llm_client()
         await self.monitor.shutdown()
 
 # Usage Example
@@ -189,5 +269,25 @@ async def main():
     finally:
         await pipeline.shutdown()
 
+def install_event_loop() -> None:
+    """Use the fastest available event loop: uringcore, then uvloop.
+
+    Must be called before the event loop is created. Falls back to the
+    default asyncio loop when neither is installed.
+    """
+    try:
+        import uringcore
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        return
+    except ImportError:
+        pass
+    
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
 if __name__ == "__main__":
+    install_event_loop()
     asyncio.run(main())
@@ -0,0 +1,28 @@
+from typing import Any, Dict, Hashable
+
+class ContentStore:
+    """Per-pipeline payload store shared by all agents.
+
+    Large payloads that several stages read (such as the research data)
+    are stored once and passed between agents by reference. All access
+    happens on the pipeline's event loop, so plain dict operations are
+    atomic between awaits.
+    """
+
+    def __init__(self):
+        self._data: Dict[Hashable, Dict[str, Any]] = {}
+
+    async def put(self, pipeline_id: Hashable, key: str, value: Any) -> None:
+        """Store a payload for a pipeline."""
+        self._data.setdefault(pipeline_id, {})[key] = value
+
+    async def get(self, pipeline_id: Hashable, key: str, default: Any = None) -> Any:
+        """Fetch a payload stored for a pipeline."""
+        return self._data.get(pipeline_id, {}).get(key, default)
+
+    def drop(self, pipeline_id: Hashable) -> None:
+        """Remove every payload stored for a pipeline."""
+        self._data.pop(pipeline_id, None)
+
+    def __contains__(self, pipeline_id: Hashable) -> bool:
+        return pipeline_id in self._data
@@ -0,0 +1,75 @@
+from typing import Any, List, Optional, Set
+import asyncio
+from abc import ABC, abstractmethod
+
+class AsyncBatcher(ABC):
+    """Coalesce concurrent submissions into batched backend calls.
+
+    Items submitted within ``max_queue_time`` seconds of each other (up to
+    ``max_batch_size`` items) are handed to ``process_batch`` together, and
+    each caller receives the result at its own position in the batch.
+    Subclasses implement ``process_batch``.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_queue_time: float = 0.02):
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._pending: List = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @abstractmethod
+    async def process_batch(self, batch: List[Any]) -> List[Any]:
+        """Process a batch of items, returning one result per item."""
+        pass
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_queue_time, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Dispatch the pending items as a single batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_queue_time, self._flush
+            )
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List) -> None:
+        """Run process_batch and resolve each caller's future."""
+        items = [item for item, _ in batch]
+        try:
+            results = await self.process_batch(items)
+            if len(results) != len(items):
+                raise ValueError(
+                    f"process_batch returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
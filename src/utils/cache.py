@@ -0,0 +1,72 @@
+from typing import Any, Callable, Hashable, Optional
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get a cached value and mark it as recently used."""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the oldest entry when full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Remove a value from the cache."""
+        return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire ``ttl`` seconds after being set."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600,
+                 timer: Callable[[], float] = time.monotonic):
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.timer = timer
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get a cached value if it has not expired."""
+        entry = super().get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if self.timer() >= expires_at:
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value that expires after the cache's ttl."""
+        super().set(key, (value, self.timer() + self.ttl))
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Remove a value from the cache."""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and self.timer() < entry[1]
@@ -1,27 +1,102 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 import yaml
+import copy
 import os
+import pickle
 import logging
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=1024)
+def _parse_path(key: str) -> Tuple[str, ...]:
+    """Split a dotted config key into its parts."""
+    return tuple(key.split('.'))
+
+def _copy_sections(section: Dict) -> Dict:
+    """Copy a section and every nested section, sharing the leaf values."""
+    root = dict(section)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for name, value in node.items():
+            if isinstance(value, dict):
+                node[name] = dict(value)
+                stack.append(node[name])
+    return root
+
+# Section -> fields that must be present in it
+REQUIRED_SCHEMA = {
+    "llm": ["api_key"],
+    "agents.researcher": ["search_apis", "max_sources"],
+    "agents.writer": ["style_guide", "tone"],
+    "agents.editor": ["grammar_checker", "style_guide"],
+    "agents.seo": ["tools"],
+    "agents.image": ["generator", "style"],
+    "agents.publisher": ["platforms"]
+}
+
+# Section -> fields that must also be non-empty
+REQUIRED_VALUES = {
+    "llm": ["api_key"],
+    "agents.researcher": ["search_apis"]
+}
+
 class Config:
     def __init__(self, config_data: Dict):
         self._config = config_data
+        self._flat: Dict[str, Any] = {}
+        self._dirty = True
+        self._llm_client = None
         self._validate_config()
 
     @classmethod
     def load_from_file(cls, file_path: str) -> 'Config':
-        """Load configuration from YAML file."""
+        """Load configuration from YAML file.
+
+        The parsed data is cached in a pickle next to the YAML file and
+        reused while it is at least as new as the YAML.
+        """
         try:
-            with open(file_path, 'r') as f:
-                config_data = yaml.safe_load(f)
+            cache_path = f"{file_path}.pkl"
+            config_data = cls._load_cached(file_path, cache_path)
+            if config_data is None:
+                with open(file_path, 'r') as f:
+                    config_data = yaml.load(f, Loader=_Loader)
+                cls._write_cache(cache_path, config_data)
             return cls(config_data)
         except Exception as e:
             logger.error(f"Failed to load config from {file_path}: {e}")
             raise
 
+    @staticmethod
+    def _load_cached(file_path: str, cache_path: str) -> Optional[Dict]:
+        """Load the parsed config snapshot if it is up to date."""
+        try:
+            if os.path.getmtime(cache_path) < os.path.getmtime(file_path):
+                return None
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    @staticmethod
+    def _write_cache(cache_path: str, config_data: Dict) -> None:
+        """Write the parsed config snapshot, ignoring unwritable locations."""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(config_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug(f"Could not write config cache {cache_path}: {e}")
+
     @classmethod
     def load_from_env(cls) -> 'Config':
         """Load configuration from environment variables."""
@@ -46,17 +121,59 @@ class Config:
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation."""
-        try:
-            value = self._config
-            for part in key.split('.'):
-                value = value[part]
-            return value
-        except (KeyError, TypeError):
-            return default
+        if self._dirty:
+            self._rebuild_flat()
+        value = self._flat.get(key, default)
+        # Callers get their own sections, so editing one cannot leave the
+        # index out of step with the config
+        if isinstance(value, dict):
+            return _copy_sections(value)
+        return value
+
+    def _rebuild_flat(self) -> None:
+        """Index every value, including nested sections, by its dotted path."""
+        flat = {}
+        stack = [("", self._config)]
+        while stack:
+            prefix, node = stack.pop()
+            for name, value in node.items():
+                path = f"{prefix}{name}"
+                flat[path] = value
+                if isinstance(value, dict):
+                    stack.append((f"{path}.", value))
+        self._flat = flat
+        self._dirty = False
+
+    def llm_client(self) -> Any:
+        """Return the LLM client shared by every user of this config.
+
+        Built on first use, so all agents share one HTTP/2 connection pool
+        instead of each opening their own connections.
+        """
+        if self._llm_client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            self._llm_client = AsyncOpenAI(
+                api_key=self.get("llm.api_key"),
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=self.get("llm.max_connections", 64),
+                        max_keepalive_connections=self.get("llm.max_keepalive_connections", 32)
+                    )
+                )
+            )
+        return self._llm_client
+
+    async def close_llm_client(self) -> None:
+        """Close the shared LLM client, if it was created."""
+        if self._llm_client is not None:
+            await self._llm_client.close()
+            self._llm_client = None
 
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation."""
-        parts = key.split('.')
+        parts = _parse_path(key)
         config = self._config
         
         for part in parts[:-1]:
@@ -65,104 +182,24 @@ class Config:
             config = config[part]
             
         config[parts[-1]] = value
+        self._dirty = True
 
     def _validate_config(self) -> None:
         """Validate configuration structure and required fields."""
-        required_sections = [
-            "llm",
-            "agents.researcher",
-            "agents.writer",
-            "agents.editor",
-            "agents.seo",
-            "agents.image",
-            "agents.publisher"
-        ]
-        
-        for section in required_sections:
-            if not self.get(section):
-                raise ValueError(f"Missing required config section: {section}")
-
-        self._validate_api_keys()
-        self._validate_agent_configs()
-
-    def _validate_api_keys(self) -> None:
-        """Validate required API keys are present."""
-        required_keys = [
-            ("llm.api_key", "OpenAI API key"),
-            ("agents.researcher.search_apis", "Search API configuration")
-        ]
-        
-        for key, description in required_keys:
-            if not self.get(key):
-                raise ValueError(f"Missing required {description}")
-
-    def _validate_agent_configs(self) -> None:
-        """Validate agent-specific configurations."""
-        agent_validations = {
-            "researcher": self._validate_researcher_config,
-            "writer": self._validate_writer_config,
-            "editor": self._validate_editor_config,
-            "seo": self._validate_seo_config,
-            "image": self._validate_image_config,
-            "publisher": self._validate_publisher_config
-        }
-        
-        for agent, validation_func in agent_validations.items():
-            validation_func()
-
-    def _validate_researcher_config(self) -> None:
-        """Validate researcher agent configuration."""
-        researcher_config = self.get("agents.researcher", {})
-        required_fields = ["search_apis", "max_sources"]
-        
-        for field in required_fields:
-            if field not in researcher_config:
-                raise ValueError(f"Missing required researcher config: {field}")
-
-    def _validate_writer_config(self) -> None:
-        """Validate writer agent configuration."""
-        writer_config = self.get("agents.writer", {})
-        required_fields = ["style_guide", "tone"]
-        
-        for field in required_fields:
-            if field not in writer_config:
-                raise ValueError(f"Missing required writer config: {field}")
-
-    def _validate_editor_config(self) -> None:
-        """Validate editor agent configuration."""
-        editor_config = self.get("agents.editor", {})
-        required_fields = ["grammar_checker", "style_guide"]
-        
-        for field in required_fields:
-            if field not in editor_config:
-                raise ValueError(f"Missing required editor config: {field}")
-
-    def _validate_seo_config(self) -> None:
-        """Validate SEO agent configuration."""
-        seo_config = self.get("agents.seo", {})
-        required_fields = ["tools"]
-        
-        for field in required_fields:
-            if field not in seo_config:
-                raise ValueError(f"Missing required SEO config: {field}")
-
-    def _validate_image_config(self) -> None:
-        """Validate image agent configuration."""
-        image_config = self.get("agents.image", {})
-        required_fields = ["generator", "style"]
-        
-        for field in required_fields:
-            if field not in image_config:
-                raise ValueError(f"Missing required image config: {field}")
-
-    def _validate_publisher_config(self) -> None:
-        """Validate publisher agent configuration."""
-        publisher_config = self.get("agents.publisher", {})
-        required_fields = ["platforms"]
+        missing = []
+        for section, fields in REQUIRED_SCHEMA.items():
+            values = self.get(section)
+            if not values:
+                missing.append(section)
+                continue
+            for field in fields:
+                if field not in values:
+                    missing.append(f"{section}.{field}")
+                elif field in REQUIRED_VALUES.get(section, ()) and not values[field]:
+                    missing.append(f"{section}.{field}")
         
-        for field in required_fields:
-            if field not in publisher_config:
-                raise ValueError(f"Missing required publisher config: {field}")
+        if missing:
+            raise ValueError(f"Missing required config: {', '.join(missing)}")
 
     def save(self, file_path: Optional[str] = None) -> None:
         """Save current configuration to file."""
@@ -171,7 +208,7 @@ class Config:
             
         try:
             with open(file_path, 'w') as f:
-                yaml.safe_dump(self._config, f, default_flow_style=False)
+                yaml.dump(self._config, f, Dumper=_Dumper, default_flow_style=False)
         except Exception as e:
             logger.error(f"Failed to save config to {file_path}: {e}")
             raise
@@ -179,16 +216,26 @@ class Config:
     def merge(self, other_config: 'Config') -> None:
         """Merge another config into this one."""
         self._merge_dict(self._config, other_config._config)
+        self._dirty = True
         self._validate_config()
 
     def _merge_dict(self, dict1: Dict, dict2: Dict) -> None:
-        """Recursively merge dictionaries."""
-        for key, value in dict2.items():
-            if key in dict1 and isinstance(dict1[key], dict) and isinstance(value, dict):
-                self._merge_dict(dict1[key], value)
-            else:
-                dict1[key] = value
-
-    def to_dict(self) -> Dict:
-        """Convert config to dictionary."""
-        return self._config.copy()
+        """Merge dict2 into dict1, descending into nested sections."""
+        stack = [(dict1, dict2)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    stack.append((target[key], value))
+                else:
+                    target[key] = value
+
+    def to_dict(self, deep: bool = False) -> Dict:
+        """Convert config to dictionary.
+
+        The default copy has its own sections but shares leaf values such
+        as lists with the config; pass ``deep=True`` for a full copy.
+        """
+        if deep:
+            return copy.deepcopy(self._config)
+        return _copy_sections(self._config)
@@ -0,0 +1,93 @@
+from typing import List, Optional, Tuple, Union
+import hashlib
+import re
+
+from .cache import LRUCache
+
+# Quoted substrings are treated as the variable parts of a prompt
+_SLOT_RE = re.compile(r"'([^'\n]*)'|\"([^\"\n]*)\"")
+_SLOT_TOKEN = "\x00"
+
+# Slot values shorter than this are too generic to substitute into responses
+MIN_SLOT_LENGTH = 3
+
+ResponseTemplate = List[Union[str, int]]
+
+class StructuralCache:
+    """Cache responses by prompt structure rather than exact prompt text.
+
+    A prompt is split into a skeleton (everything outside quoted strings)
+    and its slot values (the quoted strings). Responses are stored as
+    templates in which occurrences of the prompt's slot values are
+    replaced by slot references, so a later prompt with the same skeleton
+    but different values gets the stored response with its own values
+    filled in.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self._entries = LRUCache(maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, prompt: str) -> Optional[str]:
+        """Return a response for a structurally identical prompt, if cached."""
+        key, values = self._templatize(prompt)
+        template = self._entries.get(key)
+        if template is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return "".join(
+            values[part] if isinstance(part, int) else part
+            for part in template
+        )
+
+    def store(self, prompt: str, response: str) -> None:
+        """Store a response under the prompt's skeleton."""
+        key, values = self._templatize(prompt)
+        self._entries.set(key, self._response_template(response, values))
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _templatize(self, prompt: str) -> Tuple[str, List[str]]:
+        """Split a prompt into a skeleton hash and its slot values."""
+        values = []
+
+        def replace(match: re.Match) -> str:
+            values.append(match.group(1) if match.group(1) is not None else match.group(2))
+            return _SLOT_TOKEN
+
+        skeleton = _SLOT_RE.sub(replace, prompt)
+        key = hashlib.blake2b(skeleton.encode(), digest_size=16).hexdigest()
+        return key, values
+
+    def _response_template(self, response: str, values: List[str]) -> ResponseTemplate:
+        """Replace slot values in a response with references to their slots."""
+        slots = {}
+        for i, value in enumerate(values):
+            if len(value) >= MIN_SLOT_LENGTH:
+                slots.setdefault(value, i)
+        if not slots:
+            return [response]
+
+        # Longest values first so overlapping values resolve to the most specific slot
+        pattern = re.compile("|".join(
+            re.escape(value) for value in sorted(slots, key=len, reverse=True)
+        ))
+
+        template: ResponseTemplate = []
+        last = 0
+        for match in pattern.finditer(response):
+            if match.start() > last:
+                template.append(response[last:match.start()])
+            template.append(slots[match.group(0)])
+            last = match.end()
+        if last < len(response):
+            template.append(response[last:])
+        return template
@@ -1,15 +1,136 @@
 from typing import Dict, List, Optional, Any
+import asyncio
+import http.client
 import logging
+import os
 import re
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
 import spacy
-from nltk.tokenize import sent_tokenize
 import language_tool_python
+import requests
+from requests.adapters import HTTPAdapter
+from language_tool_python.utils import LanguageToolError
 
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional accelerator
+    ahocorasick = None
+
+from .cache import LRUCache
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Suggestions only use the parser (sentences, dependencies) and tagger
+# (fine-grained tags), so the remaining components are not loaded
+_DISABLED_COMPONENTS = ("ner", "lemmatizer", "attribute_ruler")
+
+# Words at least this long, or ending in one of these suffixes, count as advanced
+_ADVANCED_WORD_LENGTH = 12
+_ADVANCED_SUFFIXES = ("tion", "ology", "esque")
+# Adverbs
+_FORMAL_SUFFIX_RE = re.compile(r"\w+ly\b", re.IGNORECASE)
+# Formal pronouns and conjunctions
+_FORMAL_WORDS = frozenset({"whom", "therefore", "furthermore", "nevertheless"})
+_INFORMAL_WORDS = frozenset({"gonna", "wanna", "dunno", "lol", "btw"})
+
+# LanguageTool category -> base issue severity
+_CATEGORY_SEVERITY = {
+    "TYPOS": "low",
+    "PUNCTUATION": "low",
+    "GRAMMAR": "medium",
+    "STYLE": "low",
+    "CASING": "low",
+    "COLLOCATIONS": "medium",
+    "CONFUSED_WORDS": "high",
+    "REDUNDANCY": "low",
+    "TYPOGRAPHY": "low",
+    "MISC": "low"
+}
+
+_SEVERITY_LEVELS = {"low": 0, "medium": 1, "high": 2}
+
+# Dependency labels counted by the sentence complexity score
+_CLAUSE_DEPS = frozenset({"ccomp", "xcomp", "advcl"})
+_PHRASE_DEPS = frozenset({"prep", "npadvmod", "pobj"})
+
+# Byte lookup table marking ASCII vowels, used to count syllables
+_VOWEL_BYTES = np.zeros(256, dtype=bool)
+_VOWEL_BYTES[np.frombuffer(b"aeiouy", dtype=np.uint8)] = True
+
+# Redundant phrase -> suggested replacement
+_REDUNDANT_PHRASES = {
+    "absolutely essential": "essential",
+    "basic fundamentals": "fundamentals",
+    "completely filled": "filled",
+    "end result": "result",
+    "future plans": "plans"
+}
+_REDUNDANT_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in _REDUNDANT_PHRASES), re.IGNORECASE
+)
+
+@lru_cache(maxsize=None)
+def _load_nlp(model: str) -> Any:
+    """Load a spaCy pipeline once per process."""
+    return spacy.load(model, disable=list(_DISABLED_COMPONENTS))
+
+class _PooledLanguageTool(language_tool_python.LanguageTool):
+    """LanguageTool client that keeps its server connections alive.
+
+    The stock client opens a new connection and sends the text in the
+    query string for every check. This one reuses a pooled session and
+    posts the text as a form body.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # The base constructor already queries the server
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(
+            pool_connections=1, pool_maxsize=16
+        ))
+        super().__init__(*args, **kwargs)
+
+    def _query_server(self, url, params=None, num_tries=2):
+        for n in range(num_tries):
+            try:
+                if params is None:
+                    response = self._session.get(url, timeout=self._TIMEOUT)
+                else:
+                    response = self._session.post(url, data=params, timeout=self._TIMEOUT)
+                with response:
+                    try:
+                        return response.json()
+                    except ValueError:
+                        raise LanguageToolError(response.content.decode())
+            except (IOError, http.client.HTTPException) as e:
+                if self._remote is False:
+                    self._terminate_server()
+                    self._start_local_server()
+                if n + 1 >= num_tries:
+                    raise LanguageToolError(f"{self._url}: {e}")
+
+    def close(self):
+        super().close()
+        self._session.close()
+
+@lru_cache(maxsize=None)
+def _load_language_tool(language: str) -> Any:
+    """Start one LanguageTool server per language for the whole process.
+
+    The server caches its own results and checks requests from several
+    threads concurrently.
+    """
+    return _PooledLanguageTool(language, config={
+        "cacheSize": 10000,
+        "pipelineCaching": True,
+        "maxCheckThreads": os.cpu_count() or 1
+    })
+
 @dataclass
 class GrammarIssue:
     category: str
@@ -19,24 +140,49 @@ class GrammarIssue:
     position: Dict[str, int]
     severity: str
 
+@dataclass
+class TokenStats:
+    """Token-level counts shared by the suggestion analyzers."""
+    sentences: List[Any]
+    words: List[str]
+    alpha_words: List[str]
+    content_words: int
+    formal_count: int
+    informal_count: int
+    passive_count: int
+    sentence_lengths: List[int]
+    sentence_word_counts: List[int]
+    complexity_scores: List[float]
+
 class GrammarChecker:
     def __init__(self, config: Config):
         self.config = config
         self.language = config.get("editor.language", "en-US")
-        self.tool = language_tool_python.LanguageTool(self.language)
-        self.nlp = spacy.load("en_core_web_sm")
-        self.issue_history = []
+        self.tool = _load_language_tool(self.language)
+        # Text -> LanguageTool matches, so resubmitted text skips the server
+        self._check_cache = LRUCache(config.get("editor.grammar.cache_size", 2048))
+        self._min_severity_level = _SEVERITY_LEVELS[
+            config.get("editor.grammar.min_severity", "low")
+        ]
+        self._excluded_categories = frozenset(
+            config.get("editor.grammar.excluded_categories", [])
+        )
+        self.nlp = _load_nlp("en_core_web_sm")
+        self._redundant_automaton = self._build_redundant_automaton()
+        self.issue_history: deque = deque(
+            maxlen=config.get("editor.grammar.history_max", 10_000)
+        )
 
     async def check_text(self, text: str) -> List[GrammarIssue]:
         """Check text for grammar issues."""
         try:
             # Get LanguageTool matches
-            matches = self.tool.check(text)
+            matches = await self._check(text)
             
             # Convert matches to GrammarIssue objects
             issues = []
             for match in matches:
-                issue = await self._create_grammar_issue(match, text)
+                issue = self._create_grammar_issue(match, text)
                 if self._should_report_issue(issue):
                     issues.append(issue)
                     
@@ -49,7 +195,48 @@ class GrammarChecker:
             logger.error(f"Grammar check error: {e}")
             return []
 
-    async def _create_grammar_issue(
+    async def check_batch(self, texts: List[str]) -> List[List[GrammarIssue]]:
+        """Check several texts for grammar issues with one LanguageTool call."""
+        separator = "\n\n"
+        
+        # Record where each text starts in the combined text
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(separator)
+        combined = separator.join(texts)
+        
+        results = [[] for _ in texts]
+        try:
+            matches = await self._check(combined)
+            
+            for match in matches:
+                index = bisect_right(starts, match.offset) - 1
+                issue = self._create_grammar_issue(match, combined)
+                issue.position["offset"] -= starts[index]
+                if self._should_report_issue(issue):
+                    results[index].append(issue)
+            
+            # Add to issue history
+            for issues in results:
+                self.issue_history.extend(issues)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Grammar check error: {e}")
+            return [[] for _ in texts]
+
+    async def _check(self, text: str) -> List[Any]:
+        """Run LanguageTool on text, reusing results for text seen before."""
+        matches = self._check_cache.get(text)
+        if matches is None:
+            matches = await asyncio.to_thread(self.tool.check, text)
+            self._check_cache.set(text, matches)
+        return matches
+
+    def _create_grammar_issue(
         self,
         match: Any,
         text: str
@@ -69,21 +256,8 @@ class GrammarChecker:
 
     def _determine_severity(self, match: Any) -> str:
         """Determine issue severity."""
-        category_severity = {
-            "TYPOS": "low",
-            "PUNCTUATION": "low",
-            "GRAMMAR": "medium",
-            "STYLE": "low",
-            "CASING": "low",
-            "COLLOCATIONS": "medium",
-            "CONFUSED_WORDS": "high",
-            "REDUNDANCY": "low",
-            "TYPOGRAPHY": "low",
-            "MISC": "low"
-        }
-        
         # Get base severity from category
-        severity = category_severity.get(match.category, "medium")
+        severity = _CATEGORY_SEVERITY.get(match.category, "medium")
         
         # Adjust based on rule ID
         if "CONFUSION_RULE" in match.ruleId:
@@ -96,53 +270,102 @@ class GrammarChecker:
     def _should_report_issue(self, issue: GrammarIssue) -> bool:
         """Determine if issue should be reported based on configuration."""
         # Check severity threshold
-        min_severity = self.config.get("editor.grammar.min_severity", "low")
-        severity_levels = {"low": 0, "medium": 1, "high": 2}
-        
-        if severity_levels[issue.severity] < severity_levels[min_severity]:
+        if _SEVERITY_LEVELS[issue.severity] < self._min_severity_level:
             return False
             
         # Check category filters
-        excluded_categories = self.config.get(
-            "editor.grammar.excluded_categories",
-            []
-        )
-        if issue.category in excluded_categories:
+        if issue.category in self._excluded_categories:
             return False
             
         return True
 
     async def get_suggestions(self, text: str) -> Dict:
         """Get improvement suggestions for text."""
-        doc = self.nlp(text)
-        
+        doc = await asyncio.to_thread(self.nlp, text)
+        return self._suggestions_for_doc(doc)
+
+    async def get_suggestions_batch(self, texts: List[str]) -> List[Dict]:
+        """Get improvement suggestions for several texts.
+
+        The texts are parsed together with ``nlp.pipe`` in a worker thread,
+        so spaCy can batch them without blocking the event loop.
+        """
+        batch_size = self.config.get("editor.grammar.batch_size", 32)
+        docs = await asyncio.to_thread(
+            list, self.nlp.pipe(texts, batch_size=batch_size)
+        )
+        return [self._suggestions_for_doc(doc) for doc in docs]
+
+    def _suggestions_for_doc(self, doc: Any) -> Dict:
+        """Build improvement suggestions from a parsed document."""
+        stats = self._collect_token_stats(doc)
         return {
-            "sentence_structure": await self._analyze_sentence_structure(doc),
-            "readability": await self._analyze_readability(doc),
-            "vocabulary": await self._analyze_vocabulary(doc),
-            "style": await self._analyze_style(doc)
+            "sentence_structure": self._analyze_sentence_structure(stats),
+            "readability": self._analyze_readability(stats),
+            "vocabulary": self._analyze_vocabulary(doc, stats),
+            "style": self._analyze_style(doc, stats)
         }
 
-    async def _analyze_sentence_structure(self, doc: Any) -> Dict:
-        """Analyze sentence structure."""
-        sentences = list(doc.sents)
+    def _collect_token_stats(self, doc: Any) -> TokenStats:
+        """Gather everything the analyzers need in one pass over the tokens."""
+        stats = TokenStats(
+            sentences=[], words=[], alpha_words=[], content_words=0,
+            formal_count=0, informal_count=0, passive_count=0,
+            sentence_lengths=[], sentence_word_counts=[], complexity_scores=[]
+        )
         
+        for sent in doc.sents:
+            word_count = clause_count = phrase_count = 0
+            passive = False
+            for token in sent:
+                if not token.is_punct:
+                    stats.words.append(token.text)
+                    word_count += 1
+                if token.is_alpha:
+                    stats.alpha_words.append(token.text.lower())
+                    if not token.is_stop:
+                        stats.content_words += 1
+                if self._is_formal_indicator(token):
+                    stats.formal_count += 1
+                if self._is_informal_indicator(token):
+                    stats.informal_count += 1
+                
+                dep = token.dep_
+                if dep in _CLAUSE_DEPS:
+                    clause_count += 1
+                elif dep in _PHRASE_DEPS:
+                    phrase_count += 1
+                elif not passive and self._is_passive_marker(token):
+                    passive = True
+            
+            stats.sentences.append(sent)
+            stats.sentence_lengths.append(len(sent))
+            stats.sentence_word_counts.append(word_count)
+            stats.complexity_scores.append(
+                1.0 + (0.1 * clause_count) + (0.05 * phrase_count)
+            )
+            if passive:
+                stats.passive_count += 1
+        
+        return stats
+
+    def _analyze_sentence_structure(self, stats: TokenStats) -> Dict:
+        """Analyze sentence structure."""
         return {
-            "average_length": sum(len(sent) for sent in sentences) / len(sentences),
-            "complexity_score": self._calculate_complexity_score(sentences),
-            "suggestions": await self._get_structure_suggestions(sentences)
+            "average_length": sum(stats.sentence_lengths) / len(stats.sentence_lengths),
+            "complexity_score": sum(stats.complexity_scores) / len(stats.complexity_scores),
+            "suggestions": self._get_structure_suggestions(stats.sentences)
         }
 
-    async def _analyze_readability(self, doc: Any) -> Dict:
+    def _analyze_readability(self, stats: TokenStats) -> Dict:
         """Analyze text readability."""
-        text = doc.text
-        sentences = sent_tokenize(text)
-        words = [token.text for token in doc if not token.is_punct]
-        syllables = sum(self._count_syllables(word) for word in words)
+        num_sentences = len(stats.sentences)
+        words = stats.words
+        syllables = self._count_total_syllables(words)
         
         # Calculate various readability scores
         flesch_score = self._calculate_flesch_score(
-            len(sentences),
+            num_sentences,
             len(words),
             syllables
         )
@@ -150,49 +373,34 @@ class GrammarChecker:
         return {
             "flesch_score": flesch_score,
             "grade_level": self._calculate_grade_level(
-                len(sentences),
+                num_sentences,
                 len(words),
                 syllables
             ),
             "suggestions": self._get_readability_suggestions(flesch_score)
         }
 
-    async def _analyze_vocabulary(self, doc: Any) -> Dict:
+    def _analyze_vocabulary(self, doc: Any, stats: TokenStats) -> Dict:
         """Analyze vocabulary usage."""
-        words = [token.text.lower() for token in doc if token.is_alpha]
+        words = stats.alpha_words
         unique_words = set(words)
         
         return {
             "unique_words": len(unique_words),
             "vocabulary_richness": len(unique_words) / len(words),
             "advanced_words": self._count_advanced_words(words),
-            "suggestions": await self._get_vocabulary_suggestions(doc)
+            "suggestions": self._get_vocabulary_suggestions(doc)
         }
 
-    async def _analyze_style(self, doc: Any) -> Dict:
+    def _analyze_style(self, doc: Any, stats: TokenStats) -> Dict:
         """Analyze writing style."""
         return {
-            "voice": self._analyze_voice(doc),
-            "formality": self._analyze_formality(doc),
-            "conciseness": self._analyze_conciseness(doc),
-            "suggestions": await self._get_style_suggestions(doc)
+            "voice": self._analyze_voice(stats),
+            "formality": self._analyze_formality(stats),
+            "conciseness": self._analyze_conciseness(doc, stats),
+            "suggestions": self._get_style_suggestions(doc)
         }
 
-    def _calculate_complexity_score(self, sentences: List) -> float:
-        """Calculate sentence complexity score."""
-        scores = []
-        for sent in sentences:
-            # Count clauses, phrases, and modifiers
-            clause_count = len([token for token in sent 
-                              if token.dep_ in ["ccomp", "xcomp", "advcl"]])
-            phrase_count = len([token for token in sent 
-                              if token.dep_ in ["prep", "npadvmod", "pobj"]])
-            
-            score = 1.0 + (0.1 * clause_count) + (0.05 * phrase_count)
-            scores.append(score)
-            
-        return sum(scores) / len(scores)
-
     def _count_syllables(self, word: str) -> int:
         """Count syllables in a word."""
         word = word.lower()
@@ -212,6 +420,30 @@ class GrammarChecker:
             
         return max(1, count)
 
+    def _count_total_syllables(self, words: List[str]) -> int:
+        """Count the syllables in all words at once.
+
+        Equivalent to summing ``_count_syllables`` over the words, but the
+        vowel-group scan runs over one byte buffer in numpy.
+        """
+        if not words:
+            return 0
+        
+        # Strip the silent trailing "e" and separate words with a non-vowel byte
+        blob = "\x00".join(
+            word[:-1] if word.endswith("e") else word
+            for word in (word.lower() for word in words)
+        ).encode()
+        data = np.frombuffer(blob, dtype=np.uint8)
+        
+        vowels = _VOWEL_BYTES[data]
+        group_starts = vowels.copy()
+        group_starts[1:] &= ~vowels[:-1]
+        
+        word_ids = np.cumsum(data == 0)
+        counts = np.bincount(word_ids[group_starts], minlength=len(words))
+        return int(np.maximum(counts, 1).sum())
+
     def _calculate_flesch_score(
         self,
         num_sentences: int,
@@ -246,51 +478,29 @@ class GrammarChecker:
         """Count advanced vocabulary words."""
         # This is a simplified implementation
         # In practice, you'd want a comprehensive dictionary of advanced words
-        advanced_word_patterns = [
-            r'\w{12,}',  # Words with 12+ characters
-            r'\w+tion\b',  # Words ending in 'tion'
-            r'\w+ology\b',  # Words ending in 'ology'
-            r'\w+esque\b',  # Words ending in 'esque'
-        ]
-        
-        count = 0
-        for word in words:
-            for pattern in advanced_word_patterns:
-                if re.match(pattern, word, re.IGNORECASE):
-                    count += 1
-                    break
-                    
-        return count
+        # Words are lowercase alphabetic tokens; a bare suffix is not advanced
+        return sum(
+            1 for word in words
+            if len(word) >= _ADVANCED_WORD_LENGTH
+            or (word.endswith(_ADVANCED_SUFFIXES) and word not in _ADVANCED_SUFFIXES)
+        )
 
-    def _analyze_voice(self, doc: Any) -> Dict:
+    def _analyze_voice(self, stats: TokenStats) -> Dict:
         """Analyze active vs passive voice."""
-        sentences = list(doc.sents)
-        passive_count = 0
-        active_count = 0
+        total = len(stats.sentences)
+        passive_count = stats.passive_count
+        active_count = total - passive_count
         
-        for sent in sentences:
-            if self._is_passive_voice(sent):
-                passive_count += 1
-            else:
-                active_count += 1
-                
-        total = passive_count + active_count
         return {
             "active_ratio": active_count / total if total > 0 else 0,
             "passive_ratio": passive_count / total if total > 0 else 0
         }
 
-    def _analyze_formality(self, doc: Any) -> Dict:
+    def _analyze_formality(self, stats: TokenStats) -> Dict:
         """Analyze text formality."""
-        formal_indicators = 0
-        informal_indicators = 0
+        formal_indicators = stats.formal_count
+        informal_indicators = stats.informal_count
         
-        for token in doc:
-            if self._is_formal_indicator(token):
-                formal_indicators += 1
-            if self._is_informal_indicator(token):
-                informal_indicators += 1
-                
         total = formal_indicators + informal_indicators
         return {
             "formality_score": formal_indicators / total if total > 0 else 0.5,
@@ -298,88 +508,81 @@ class GrammarChecker:
             "informal_indicators": informal_indicators
         }
 
-    def _analyze_conciseness(self, doc: Any) -> Dict:
+    def _analyze_conciseness(self, doc: Any, stats: TokenStats) -> Dict:
         """Analyze text conciseness."""
-        words = [token.text for token in doc if not token.is_punct]
-        content_words = [token.text for token in doc if token.is_alpha 
-                        and not token.is_stop]
+        words = stats.words
         
         return {
-            "content_density": len(content_words) / len(words) if words else 0,
+            "content_density": stats.content_words / len(words) if words else 0,
             "redundant_phrases": self._find_redundant_phrases(doc),
-            "wordiness_score": self._calculate_wordiness(doc)
+            "wordiness_score": self._calculate_wordiness(stats)
         }
 
-    def _is_passive_voice(self, sent: Any) -> bool:
-        """Check if sentence is in passive voice."""
+    def _is_passive_marker(self, token: Any) -> bool:
+        """Check if token marks a passive voice sentence."""
         # Look for passive voice pattern: be + past participle
-        for token in sent:
-            if (token.dep_ == "auxpass" or 
-                (token.dep_ == "aux" and token.head.tag_ == "VBN")):
-                return True
-        return False
+        return (token.dep_ == "auxpass" or
+                (token.dep_ == "aux" and token.head.tag_ == "VBN"))
 
     def _is_formal_indicator(self, token: Any) -> bool:
         """Check if token indicates formal language."""
-        formal_patterns = [
-            r'\w+ly\b',  # Adverbs
-            r'\w+whom\b',  # Formal pronouns
-            r'\w+therefore\b',  # Formal conjunctions
-            r'\w+furthermore\b',
-            r'\w+nevertheless\b'
-        ]
-        
-        return any(re.match(pattern, token.text, re.IGNORECASE) 
-                  for pattern in formal_patterns)
+        return (
+            token.text.lower() in _FORMAL_WORDS
+            or _FORMAL_SUFFIX_RE.match(token.text) is not None
+        )
 
     def _is_informal_indicator(self, token: Any) -> bool:
         """Check if token indicates informal language."""
-        informal_patterns = [
-            r'\w+gonna\b',
-            r'\w+wanna\b',
-            r'\w+dunno\b',
-            r'\blol\b',
-            r'\bbtw\b'
-        ]
-        
-        return any(re.match(pattern, token.text, re.IGNORECASE) 
-                  for pattern in informal_patterns)
+        return token.text.lower() in _INFORMAL_WORDS
 
     def _find_redundant_phrases(self, doc: Any) -> List[Dict]:
         """Find redundant phrases in text."""
-        redundant_patterns = [
-            (r'absolutely essential', 'essential'),
-            (r'basic fundamentals', 'fundamentals'),
-            (r'completely filled', 'filled'),
-            (r'end result', 'result'),
-            (r'future plans', 'plans')
-        ]
-        
-        findings = []
         text = doc.text
-        for pattern, suggestion in redundant_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                findings.append({
-                    "phrase": match.group(),
-                    "suggestion": suggestion,
-                    "position": {
-                        "start": match.start(),
-                        "end": match.end()
-                    }
-                })
-                
-        return findings
+        text_lower = text.lower()
+        
+        # Lowercasing can change the length of some non-ASCII text, which
+        # would shift the automaton's offsets
+        if self._redundant_automaton is None or len(text_lower) != len(text):
+            spans = (
+                (match.start(), match.end(), match.group().lower())
+                for match in _REDUNDANT_RE.finditer(text)
+            )
+        else:
+            spans = (
+                (end - len(phrase) + 1, end + 1, phrase)
+                for end, phrase in self._redundant_automaton.iter(text_lower)
+            )
+        
+        return [
+            {
+                "phrase": text[start:end],
+                "suggestion": _REDUNDANT_PHRASES[phrase],
+                "position": {
+                    "start": start,
+                    "end": end
+                }
+            }
+            for start, end, phrase in spans
+        ]
+
+    @staticmethod
+    def _build_redundant_automaton() -> Any:
+        """Build a matcher that finds every redundant phrase in one pass."""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for phrase in _REDUNDANT_PHRASES:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return automaton
 
-    def _calculate_wordiness(self, doc: Any) -> float:
+    def _calculate_wordiness(self, stats: TokenStats) -> float:
         """Calculate wordiness score."""
-        sentences = list(doc.sents)
-        if not sentences:
+        counts = stats.sentence_word_counts
+        if not counts:
             return 0.0
             
-        total_words = sum(len([token for token in sent if not token.is_punct]) 
-                         for sent in sentences)
-        average_words = total_words / len(sentences)
+        average_words = sum(counts) / len(counts)
         
         # Score increases with sentence length
         # Optimal length is considered to be around 15-20 words
@@ -387,5 +590,7 @@ class GrammarChecker:
 
     async def cleanup(self) -> None:
         """Cleanup resources."""
-        self.tool.close()
-        self.issue_history = []
+        # The LanguageTool server is shared with other checkers and is
+        # stopped when the process exits
+        self._check_cache.clear()
+        self.issue_history.clear()
@@ -1,15 +1,35 @@
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 import asyncio
 from datetime import datetime
 import json
-import openai
+import orjson
+from collections import deque
+from functools import lru_cache
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional accelerator
+    tiktoken = None
+
+from .cache import LRUCache
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=8)
+def _encoding(model: str) -> "tiktoken.Encoding":
+    """Return the tokenizer for a model, loaded once per process."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def join_prompt_blocks(blocks: List[Dict]) -> str:
+    """Flatten prompt blocks into a single prompt string."""
+    return "\n\n".join(block["text"] for block in blocks if block.get("text"))
+
 class LLMInterface:
     def __init__(self, config: Config):
         self.config = config
@@ -17,9 +37,17 @@ class LLMInterface:
         self.model = config.get("llm.model", "gpt-4")
         self.temperature = config.get("llm.temperature", 0.7)
         self.max_tokens = config.get("llm.max_tokens", 2000)
-        self.request_history = []
-        
-        openai.api_key = self.api_key
+        self.request_history: deque = deque(
+            maxlen=config.get("llm.history_max", 10_000)
+        )
+        # Running totals over every request, including those evicted
+        # from the history
+        self._total_requests = 0
+        self._total_prompt_tokens = 0
+        self._total_completion_tokens = 0
+        self._total_tokens = 0
+        self.client = config.llm_client()
+        self._system_message_cache = LRUCache(64)
 
     @retry(
         stop=stop_after_attempt(3),
@@ -27,21 +55,23 @@ class LLMInterface:
     )
     async def generate(
         self,
-        prompt: str,
+        prompt: Union[str, List[Dict]],
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
         system_prompt: Optional[str] = None
     ) -> str:
-        """Generate text using the LLM."""
+        """Generate text using the LLM.
+
+        The prompt may be a list of text blocks, static blocks first. Cache
+        hints on the blocks are dropped for the OpenAI API, which caches
+        repeated prompt prefixes automatically.
+        """
+        if not isinstance(prompt, str):
+            prompt = join_prompt_blocks(prompt)
+
         try:
-            messages = []
-            
-            # Add system prompt if provided
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
+            # Start from the prebuilt system message, if any
+            messages = list(self._system_messages(system_prompt))
             
             # Add user prompt
             messages.append({
@@ -49,7 +79,7 @@ class LLMInterface:
                 "content": prompt
             })
 
-            response = await openai.ChatCompletion.acreate(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=temperature or self.temperature,
@@ -65,6 +95,35 @@ class LLMInterface:
             logger.error(f"LLM generation error: {e}")
             raise
 
+    def _system_messages(self, system_prompt: Optional[str]) -> Tuple[Dict, ...]:
+        """Return the leading messages for a system prompt, built once."""
+        if not system_prompt:
+            return ()
+        messages = self._system_message_cache.get(system_prompt)
+        if messages is None:
+            messages = ({"role": "system", "content": system_prompt},)
+            self._system_message_cache.set(system_prompt, messages)
+        return messages
+
+    async def generate_many(
+        self,
+        prompts: List[Union[str, List[Dict]]],
+        concurrency: int = 8,
+        system_prompt: Optional[str] = None
+    ) -> List[str]:
+        """Generate completions for several prompts concurrently.
+
+        At most ``concurrency`` requests are in flight at once. Results are
+        returned in prompt order.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(prompt: Union[str, List[Dict]]) -> str:
+            async with semaphore:
+                return await self.generate(prompt, system_prompt=system_prompt)
+
+        return await asyncio.gather(*(bounded(prompt) for prompt in prompts))
+
     async def generate_with_context(
         self,
         prompt: str,
@@ -89,8 +148,8 @@ class LLMInterface:
 
         response = await self.generate(prompt)
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
             logger.error("Failed to parse sentiment analysis response")
             return {
                 "score": 0.5,
@@ -109,8 +168,8 @@ class LLMInterface:
 
         response = await self.generate(prompt)
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
             logger.error("Failed to parse key points response")
             return []
 
@@ -134,49 +193,44 @@ class LLMInterface:
         return await self.generate("\n\n".join(prompt_parts))
 
     def _log_request(self, prompt: str, response: Dict) -> None:
-        """Log LLM request and response."""
+        """Log LLM request token usage."""
+        usage = response.usage
+        self._total_requests += 1
+        self._total_prompt_tokens += usage.prompt_tokens
+        self._total_completion_tokens += usage.completion_tokens
+        self._total_tokens += usage.total_tokens
+
         self.request_history.append({
             "timestamp": datetime.now().isoformat(),
             "prompt": prompt,
             "model": self.model,
-            "response": response,
             "tokens": {
-                "prompt": response.usage.prompt_tokens,
-                "completion": response.usage.completion_tokens,
-                "total": response.usage.total_tokens
+                "prompt": usage.prompt_tokens,
+                "completion": usage.completion_tokens,
+                "total": usage.total_tokens
             }
         })
 
-    async def get_token_count(self, text: str) -> int:
-        """Estimate token count for text."""
-        # Rough estimation: 1 token ≈ 4 characters
-        return len(text) // 4
+    def get_token_count(self, text: str) -> int:
+        """Count the tokens in text for the configured model."""
+        if tiktoken is None:
+            # Rough estimation: 1 token ≈ 4 characters
+            return len(text) // 4
+        return len(_encoding(self.model).encode(text))
 
     def get_usage_stats(self) -> Dict:
         """Get usage statistics."""
-        if not self.request_history:
+        if not self._total_requests:
             return {}
 
-        total_tokens = 0
-        total_requests = len(self.request_history)
-        token_distribution = {
-            "prompt": 0,
-            "completion": 0
-        }
-
-        for request in self.request_history:
-            tokens = request["tokens"]
-            total_tokens += tokens["total"]
-            token_distribution["prompt"] += tokens["prompt"]
-            token_distribution["completion"] += tokens["completion"]
-
+        total_tokens = self._total_tokens
         return {
-            "total_requests": total_requests,
+            "total_requests": self._total_requests,
             "total_tokens": total_tokens,
-            "average_tokens_per_request": total_tokens / total_requests,
+            "average_tokens_per_request": total_tokens / self._total_requests,
             "token_distribution": {
-                "prompt": token_distribution["prompt"] / total_tokens,
-                "completion": token_distribution["completion"] / total_tokens
+                "prompt": self._total_prompt_tokens / total_tokens,
+                "completion": self._total_completion_tokens / total_tokens
             }
         }
 
@@ -186,10 +240,17 @@ class LLMInterface:
         if self.config.get("llm.save_history", False):
             history_file = self.config.get("llm.history_file", "llm_history.json")
             try:
-                with open(history_file, 'w') as f:
-                    json.dump(self.request_history, f, indent=2)
+                with open(history_file, 'wb') as f:
+                    f.write(orjson.dumps(
+                        list(self.request_history),
+                        option=orjson.OPT_INDENT_2
+                    ))
             except Exception as e:
                 logger.error(f"Failed to save LLM history: {e}")
 
         # Clear memory
-        self.request_history = []
+        self.request_history.clear()
+        self._total_requests = 0
+        self._total_prompt_tokens = 0
+        self._total_completion_tokens = 0
+        self._total_tokens = 0
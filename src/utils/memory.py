@@ -1,8 +1,8 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 import logging
 from datetime import datetime
-import json
-from collections import deque
+import orjson
+from collections import Counter, deque
 import asyncio
 from pathlib import Path
 
@@ -15,38 +15,101 @@ class AgentMemory:
         self.agent_role = agent_role
         self.config = config
         self.short_term = deque(maxlen=config.get("memory.short_term_size", 100))
+        # Counts over short-term memory, kept in step with the deque
+        self._field_value_counts: Counter = Counter()
+        self._type_counts: Counter = Counter()
         self.long_term = {}
         self.patterns = {}
+        # Index key -> ids of patterns an interaction with that key can
+        # match; patterns that cannot be keyed are checked on every lookup
+        self._pattern_index: Dict[tuple, Set[str]] = {}
+        self._unindexed_patterns: Set[str] = set()
         self.memory_file = Path(config.get(
             "memory.storage_path",
             "./data/memory"
         )) / f"{agent_role}_memory.json"
+        # Changes since the last snapshot are appended here and replayed
+        # on load, so storing an interaction does not rewrite the snapshot
+        self._log_path = self.memory_file.with_suffix(".log")
+        # Pattern changes not yet written to the snapshot or log
+        self._dirty_patterns: Set[str] = set()
+        self._removed_patterns: Set[str] = set()
+        # Long-term entries not yet written to disk
+        self._pending_long_term: List[str] = []
+        
+        # Writes are coalesced by a background flush task
+        self._dirty = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._batch_max_size = config.get("memory.batch_max_size", 64)
+        self._save_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closing = False
         
         self.load_memory()
 
     async def store_interaction(self, message: Any) -> None:
         """Store an interaction in memory."""
-        interaction = self._format_interaction(message)
+        # One timestamp for everything recorded about this interaction
+        now = datetime.now()
+        now_iso = now.isoformat()
+        interaction = self._format_interaction(message, now)
         
         # Store in short-term memory
-        self.short_term.append(interaction)
+        self._push_short_term(interaction)
         
         # Update patterns
-        await self._update_patterns(interaction)
+        await self._update_patterns(interaction, now)
         
         # Potentially move to long-term memory
-        await self._consider_long_term_storage(interaction)
+        await self._consider_long_term_storage(interaction, now_iso)
+
+    def _push_short_term(self, interaction: Dict) -> None:
+        """Append to short-term memory, updating counts for evicted items."""
+        short_term = self.short_term
+        if short_term.maxlen is not None and len(short_term) >= short_term.maxlen:
+            if not short_term:
+                return
+            self._count_interaction(short_term.popleft(), -1)
+        short_term.append(interaction)
+        self._count_interaction(interaction, 1)
 
-    def _format_interaction(self, message: Any) -> Dict:
+    def _count_interaction(self, interaction: Dict, delta: int) -> None:
+        """Add or remove an interaction's type and field values from the counts."""
+        self._adjust_count(self._type_counts, interaction["type"], delta)
+        content = interaction["content"]
+        if isinstance(content, dict):
+            for key, value in content.items():
+                try:
+                    self._adjust_count(self._field_value_counts, (key, value), delta)
+                except TypeError:
+                    # Unhashable values are counted by scanning on lookup
+                    pass
+
+    @staticmethod
+    def _adjust_count(counts: Counter, key: Any, delta: int) -> None:
+        """Change a count, dropping keys that reach zero."""
+        count = counts[key] + delta
+        if count > 0:
+            counts[key] = count
+        else:
+            del counts[key]
+
+    def _format_interaction(self, message: Any, now: Optional[datetime] = None) -> Dict:
         """Format message for storage."""
+        now = now or datetime.now()
         return {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
+            # Parsed timestamp, kept in memory only
+            "_ts": now,
             "content": message.to_dict() if hasattr(message, "to_dict") else message,
             "type": type(message).__name__
         }
 
-    async def _update_patterns(self, interaction: Dict) -> None:
+    async def _update_patterns(self, interaction: Dict, now: Optional[datetime] = None) -> None:
         """Update observed patterns in interactions."""
+        now = now or datetime.now()
+        now_iso = now.isoformat()
+        
         # Extract patterns from interaction
         new_patterns = await self._extract_patterns(interaction)
         
@@ -57,15 +120,20 @@ class AgentMemory:
                 self.patterns[pattern_id] = {
                     "pattern": pattern,
                     "count": 0,
-                    "first_seen": datetime.now().isoformat(),
-                    "last_seen": datetime.now().isoformat()
+                    "first_seen": now_iso,
+                    "last_seen": now_iso
                 }
+                self._index_pattern(pattern_id, pattern)
             
             self.patterns[pattern_id]["count"] += 1
-            self.patterns[pattern_id]["last_seen"] = datetime.now().isoformat()
+            self.patterns[pattern_id]["last_seen"] = now_iso
+            self.patterns[pattern_id]["_last_seen"] = now
+            self._dirty_patterns.add(pattern_id)
+            # A pattern removed and seen again before the flush is live
+            self._removed_patterns.discard(pattern_id)
         
         # Cleanup old patterns
-        await self._cleanup_patterns()
+        await self._cleanup_patterns(now)
 
     async def _extract_patterns(self, interaction: Dict) -> List[Dict]:
         """Extract patterns from an interaction."""
@@ -88,7 +156,7 @@ class AgentMemory:
 
     def _extract_time_pattern(self, interaction: Dict) -> Optional[Dict]:
         """Extract time-based patterns."""
-        timestamp = datetime.fromisoformat(interaction["timestamp"])
+        timestamp = self._timestamp(interaction)
         
         return {
             "type": "time",
@@ -140,8 +208,12 @@ class AgentMemory:
     def _is_frequent_value(self, key: str, value: Any) -> bool:
         """Check if a value appears frequently for a given key."""
         threshold = self.config.get("memory.frequency_threshold", 3)
-        count = 0
+        try:
+            return self._field_value_counts[(key, value)] >= threshold
+        except TypeError:
+            pass
         
+        count = 0
         for interaction in self.short_term:
             if isinstance(interaction["content"], dict):
                 if interaction["content"].get(key) == value:
@@ -149,7 +221,11 @@ class AgentMemory:
                     
         return count >= threshold
 
-    async def _consider_long_term_storage(self, interaction: Dict) -> None:
+    async def _consider_long_term_storage(
+        self,
+        interaction: Dict,
+        now_iso: Optional[str] = None
+    ) -> None:
         """Consider moving interaction to long-term memory."""
         # Check if interaction matches any significant patterns
         significant_patterns = self._find_significant_patterns(interaction)
@@ -160,29 +236,114 @@ class AgentMemory:
             self.long_term[memory_key] = {
                 "interaction": interaction,
                 "patterns": significant_patterns,
-                "stored_at": datetime.now().isoformat()
+                "stored_at": now_iso or datetime.now().isoformat()
             }
             
             # Save to disk if configured
             if self.config.get("memory.persistent", True):
-                await self.save_memory()
+                self._pending_long_term.append(memory_key)
+                self._schedule_flush()
 
     def _find_significant_patterns(self, interaction: Dict) -> List[Dict]:
         """Find significant patterns related to an interaction."""
         significant_patterns = []
         pattern_threshold = self.config.get("memory.pattern_threshold", 5)
         
-        for pattern in self.patterns.values():
+        candidates = set(self._unindexed_patterns)
+        for key in self._interaction_keys(interaction):
+            candidates.update(self._pattern_index.get(key, ()))
+        
+        for pattern_id in candidates:
+            pattern = self.patterns[pattern_id]
             if pattern["count"] >= pattern_threshold:
                 if self._interaction_matches_pattern(interaction, pattern["pattern"]):
                     significant_patterns.append(pattern)
                     
         return significant_patterns
 
+    def _pattern_keys(self, pattern: Dict) -> Optional[List[tuple]]:
+        """Index keys of interactions that can match a pattern.
+
+        Returns None for patterns that have to be checked against every
+        interaction.
+        """
+        pattern_type = pattern["type"]
+        if pattern_type == "time":
+            return [(
+                "time",
+                pattern["hour"],
+                pattern["day_of_week"],
+                pattern["interaction_type"]
+            )]
+        elif pattern_type == "content":
+            # A None value also matches interactions without the field
+            if pattern["value"] is None:
+                return None
+            key = ("content", pattern["field"], pattern["value"])
+            try:
+                hash(key)
+            except TypeError:
+                return None
+            return [key]
+        elif pattern_type == "sequence":
+            return [("sequence", pattern["first"]), ("sequence", pattern["second"])]
+        
+        return []
+
+    def _interaction_keys(self, interaction: Dict) -> List[tuple]:
+        """Index keys of an interaction, matching those from _pattern_keys."""
+        timestamp = self._timestamp(interaction)
+        interaction_type = interaction["type"]
+        keys = [
+            ("time", timestamp.hour, timestamp.weekday(), interaction_type),
+            ("sequence", interaction_type)
+        ]
+        
+        content = interaction["content"]
+        if isinstance(content, dict):
+            for field, value in content.items():
+                key = ("content", field, value)
+                try:
+                    hash(key)
+                except TypeError:
+                    continue
+                keys.append(key)
+        
+        return keys
+
+    def _index_pattern(self, pattern_id: str, pattern: Dict) -> None:
+        """Add a pattern to the lookup index."""
+        keys = self._pattern_keys(pattern)
+        if keys is None:
+            self._unindexed_patterns.add(pattern_id)
+            return
+        for key in keys:
+            self._pattern_index.setdefault(key, set()).add(pattern_id)
+
+    def _unindex_pattern(self, pattern_id: str, pattern: Dict) -> None:
+        """Remove a pattern from the lookup index."""
+        keys = self._pattern_keys(pattern)
+        if keys is None:
+            self._unindexed_patterns.discard(pattern_id)
+            return
+        for key in keys:
+            pattern_ids = self._pattern_index.get(key)
+            if pattern_ids is not None:
+                pattern_ids.discard(pattern_id)
+                if not pattern_ids:
+                    del self._pattern_index[key]
+
+    def _rebuild_pattern_index(self) -> None:
+        """Index every known pattern."""
+        self._pattern_index = {}
+        self._unindexed_patterns = set()
+        for pattern_id, pattern in self.patterns.items():
+            self._index_pattern(pattern_id, pattern["pattern"])
+
     def _interaction_matches_pattern(self, interaction: Dict, pattern: Dict) -> bool:
         """Check if interaction matches a pattern."""
         if pattern["type"] == "time":
-            timestamp = datetime.fromisoformat(interaction["timestamp"])
+            timestamp = self._timestamp(interaction)
             return (
                 timestamp.hour == pattern["hour"] and
                 timestamp.weekday() == pattern["day_of_week"] and
@@ -200,30 +361,58 @@ class AgentMemory:
         
         return False
 
+    @staticmethod
+    def _timestamp(interaction: Dict) -> datetime:
+        """Return an interaction's timestamp, parsing it at most once."""
+        timestamp = interaction.get("_ts")
+        if timestamp is None:
+            timestamp = interaction["_ts"] = datetime.fromisoformat(interaction["timestamp"])
+        return timestamp
+
+    @staticmethod
+    def _without_cached(entry: Dict) -> Dict:
+        """Copy an entry without its in-memory-only fields."""
+        return {key: value for key, value in entry.items() if not key.startswith("_")}
+
     def _generate_pattern_id(self, pattern: Dict) -> str:
-        """Generate unique ID for a pattern."""
-        return f"{pattern['type']}_{hash(str(sorted(pattern.items())))}"
+        """Generate unique ID for a pattern.
+
+        IDs are built from the pattern's fields, so the same pattern gets
+        the same ID in every process.
+        """
+        pattern_type = pattern["type"]
+        if pattern_type == "time":
+            return f"time|{pattern['hour']}|{pattern['day_of_week']}|{pattern['interaction_type']}"
+        elif pattern_type == "content":
+            return f"content|{pattern['field']}|{pattern['value']!r}"
+        elif pattern_type == "sequence":
+            return f"sequence|{pattern['first']}|{pattern['second']}"
+        return f"{pattern_type}|{sorted(pattern.items())!r}"
 
     def _generate_memory_key(self, interaction: Dict) -> str:
         """Generate unique key for long-term memory storage."""
         timestamp = interaction["timestamp"].replace(":", "_")
         return f"{timestamp}_{hash(str(interaction))}"
 
-    async def _cleanup_patterns(self) -> None:
+    async def _cleanup_patterns(self, now: Optional[datetime] = None) -> None:
         """Clean up old or irrelevant patterns."""
-        now = datetime.now()
+        now = now or datetime.now()
         cleanup_threshold = self.config.get("memory.cleanup_threshold_days", 30)
         
         patterns_to_remove = []
         for pattern_id, pattern in self.patterns.items():
-            last_seen = datetime.fromisoformat(pattern["last_seen"])
+            last_seen = pattern.get("_last_seen")
+            if last_seen is None:
+                last_seen = pattern["_last_seen"] = datetime.fromisoformat(pattern["last_seen"])
             days_since_last_seen = (now - last_seen).days
             
             if days_since_last_seen > cleanup_threshold:
                 patterns_to_remove.append(pattern_id)
         
         for pattern_id in patterns_to_remove:
-            del self.patterns[pattern_id]
+            self._unindex_pattern(pattern_id, self.patterns.pop(pattern_id)["pattern"])
+            self._dirty_patterns.discard(pattern_id)
+            self._removed_patterns.add(pattern_id)
 
     async def recall(
         self,
@@ -244,7 +433,7 @@ class AgentMemory:
                 matches.append(memory["interaction"])
         
         # Sort by timestamp
-        matches.sort(key=lambda x: x["timestamp"], reverse=True)
+        matches.sort(key=self._timestamp, reverse=True)
         
         if limit:
             matches = matches[:limit]
@@ -258,7 +447,7 @@ class AgentMemory:
             
         for key, value in criteria.items():
             if key == "time_range":
-                timestamp = datetime.fromisoformat(interaction["timestamp"])
+                timestamp = self._timestamp(interaction)
                 if not (value["start"] <= timestamp <= value["end"]):
                     return False
             elif key == "type":
@@ -323,7 +512,7 @@ class AgentMemory:
         }
         
         for interaction in self.short_term:
-            timestamp = datetime.fromisoformat(interaction["timestamp"])
+            timestamp = self._timestamp(interaction)
             distribution["hourly"][timestamp.hour] += 1
             distribution["daily"][timestamp.weekday()] += 1
             
@@ -331,42 +520,211 @@ class AgentMemory:
 
     def _get_type_distribution(self) -> Dict:
         """Get distribution of interaction types."""
-        distribution = {}
-        for interaction in self.short_term:
-            interaction_type = interaction["type"]
-            distribution[interaction_type] = distribution.get(interaction_type, 0) + 1
-        return distribution
+        return dict(self._type_counts)
 
     def load_memory(self) -> None:
-        """Load memory from disk."""
+        """Load memory from disk: the snapshot, then the change log."""
         if self.memory_file.exists():
             try:
-                with open(self.memory_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.memory_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                     self.long_term = data.get("long_term", {})
                     self.patterns = data.get("patterns", {})
                     
                 logger.info(f"Loaded memory for agent {self.agent_role}")
             except Exception as e:
                 logger.error(f"Failed to load memory: {e}")
+        
+        if self._log_path.exists():
+            try:
+                self._replay_log()
+            except Exception as e:
+                logger.error(f"Failed to replay memory log: {e}")
+        
+        self._rebuild_pattern_index()
+
+    def _replay_log(self) -> None:
+        """Apply logged changes on top of the loaded snapshot."""
+        with open(self._log_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A write cut short by a crash
+                    continue
+                op = entry.get("op")
+                if op == "add_lt":
+                    self.long_term[entry["key"]] = entry["value"]
+                elif op == "upd_pat":
+                    self.patterns[entry["id"]] = entry["value"]
+                elif op == "del_pat":
+                    self.patterns.pop(entry["id"], None)
+
+    def _schedule_flush(self) -> None:
+        """Mark memory dirty, starting the flush task if needed."""
+        if self._closing:
+            return
+        self._dirty.set()
+        if len(self._pending_long_term) >= self._batch_max_size:
+            self._batch_full.set()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        """Write pending changes shortly after they are made.
+
+        Changes made while waiting are written together, so a burst of
+        stored interactions costs one disk write. A full batch is written
+        without waiting out the delay.
+        """
+        delay = self.config.get("memory.flush_delay_ms", 200) / 1000
+        while not self._closing:
+            await self._dirty.wait()
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._dirty.clear()
+            self._batch_full.clear()
+            await self._flush()
+
+    async def _stop_flush_task(self) -> None:
+        """Let the flush task write what is pending, then stop it."""
+        self._closing = True
+        if self._flush_task is not None:
+            self._dirty.set()
+            self._batch_full.set()
+            await self._flush_task
+            self._flush_task = None
+
+    async def _flush(self) -> None:
+        """Append pending long-term entries and pattern changes to the log."""
+        async with self._save_lock:
+            entries = [
+                {
+                    "op": "add_lt",
+                    "key": memory_key,
+                    "value": self._stored_long_term(self.long_term[memory_key])
+                }
+                for memory_key in self._pending_long_term
+            ]
+            entries.extend(
+                {"op": "upd_pat", "id": pattern_id, "value": self._without_cached(self.patterns[pattern_id])}
+                for pattern_id in self._dirty_patterns
+            )
+            entries.extend(
+                {"op": "del_pat", "id": pattern_id}
+                for pattern_id in self._removed_patterns
+            )
+            # Changes made while the log is written are queued afresh
+            pending = self._take_pending()
+            
+            if entries:
+                try:
+                    data = b"".join(
+                        orjson.dumps(entry, option=orjson.OPT_SERIALIZE_DATACLASS) + b"\n"
+                        for entry in entries
+                    )
+                    await asyncio.to_thread(self._append_log, data)
+                except Exception as e:
+                    logger.error(f"Failed to write memory log: {e}")
+                    self._restore_pending(pending)
+                    return
+            
+            await self._compact()
+
+    def _append_log(self, data: bytes) -> None:
+        """Append serialized entries to the change log."""
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._log_path, 'ab') as f:
+            f.write(data)
+
+    async def _compact(self) -> None:
+        """Fold the change log into a new snapshot once it grows large."""
+        try:
+            log_size = self._log_path.stat().st_size
+        except FileNotFoundError:
+            return
+        try:
+            snapshot_size = self.memory_file.stat().st_size
+        except FileNotFoundError:
+            snapshot_size = 0
+        
+        if log_size > snapshot_size * self.config.get("memory.log_compact_ratio", 1.0):
+            await self._save_snapshot()
+
+    def _stored_long_term(self, memory: Dict) -> Dict:
+        """Copy a long-term entry in its on-disk form."""
+        return {
+            **memory,
+            "interaction": self._without_cached(memory["interaction"]),
+            "patterns": [
+                self._without_cached(pattern)
+                for pattern in memory["patterns"]
+            ]
+        }
 
     async def save_memory(self) -> None:
-        """Save memory to disk."""
+        """Save a full memory snapshot to disk and clear the change log."""
+        async with self._save_lock:
+            await self._save_snapshot()
+
+    async def _save_snapshot(self) -> None:
+        """Write a snapshot of the current state; callers hold the save lock."""
+        data = {
+            "long_term": {
+                key: self._stored_long_term(memory)
+                for key, memory in self.long_term.items()
+            },
+            "patterns": {
+                pattern_id: self._without_cached(pattern)
+                for pattern_id, pattern in self.patterns.items()
+            }
+        }
+        # The snapshot covers every change made so far
+        pending = self._take_pending()
+        
         try:
-            self.memory_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(self.memory_file, 'w') as f:
-                json.dump({
-                    "long_term": self.long_term,
-                    "patterns": self.patterns
-                }, f, indent=2)
-                
+            await asyncio.to_thread(self._write_snapshot, data)
             logger.info(f"Saved memory for agent {self.agent_role}")
         except Exception as e:
             logger.error(f"Failed to save memory: {e}")
+            self._restore_pending(pending)
+
+    def _take_pending(self) -> Tuple[List[str], Set[str], Set[str]]:
+        """Detach the unsaved changes so new ones queue separately."""
+        pending = (self._pending_long_term, set(self._dirty_patterns), set(self._removed_patterns))
+        self._pending_long_term = []
+        self._dirty_patterns.clear()
+        self._removed_patterns.clear()
+        return pending
+
+    def _restore_pending(self, pending: Tuple[List[str], Set[str], Set[str]]) -> None:
+        """Requeue changes from a failed write so a later write includes them."""
+        self._pending_long_term[:0] = pending[0]
+        self._dirty_patterns |= pending[1] - self._removed_patterns
+        self._removed_patterns |= pending[2] - self._dirty_patterns
+
+    def _write_snapshot(self, data: Dict) -> None:
+        """Serialize and write a snapshot, then remove the change log."""
+        self.memory_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write then rename, so a crash never leaves a partial snapshot
+        tmp_path = self.memory_file.with_suffix(".json.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS
+            ))
+        tmp_path.replace(self.memory_file)
+        
+        # Everything logged so far is now in the snapshot
+        self._log_path.unlink(missing_ok=True)
 
     async def cleanup(self) -> None:
         """Cleanup and save memory before shutdown."""
         await self._cleanup_patterns()
         if self.config.get("memory.persistent", True):
-            await self.save_memory()
+            await self._stop_flush_task()
+            await self._flush()
@@ -0,0 +1,53 @@
+from typing import Any
+import asyncio
+from collections import deque
+
+class SPSCAsyncQueue:
+    """Lightweight unbounded queue for a single consuming coroutine.
+
+    Backed by a deque and one asyncio.Event instead of asyncio.Queue's
+    condition machinery. Any number of coroutines on the same event loop
+    may put items, but only one may wait on get() at a time.
+    """
+
+    def __init__(self):
+        self._items: deque = deque()
+        self._not_empty = asyncio.Event()
+        self._unfinished_tasks = 0
+
+    async def put(self, item: Any) -> None:
+        """Put an item into the queue."""
+        self.put_nowait(item)
+
+    def put_nowait(self, item: Any) -> None:
+        """Put an item into the queue without blocking."""
+        self._items.append(item)
+        self._unfinished_tasks += 1
+        self._not_empty.set()
+
+    async def get(self) -> Any:
+        """Remove and return an item, waiting until one is available."""
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._items.popleft()
+
+    def get_nowait(self) -> Any:
+        """Remove and return an item if one is immediately available."""
+        if not self._items:
+            raise asyncio.QueueEmpty
+        return self._items.popleft()
+
+    def task_done(self) -> None:
+        """Indicate that a previously fetched item has been processed."""
+        if self._unfinished_tasks <= 0:
+            raise ValueError("task_done() called too many times")
+        self._unfinished_tasks -= 1
+
+    def qsize(self) -> int:
+        """Number of items in the queue."""
+        return len(self._items)
+
+    def empty(self) -> bool:
+        """Return True if the queue is empty."""
+        return not self._items
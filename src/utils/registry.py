@@ -0,0 +1,26 @@
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar
+
+from .config import Config
+
+T = TypeVar("T")
+
+# (class, id(config)) -> (config, instance). The config is held so its id
+# cannot be reused by a different Config while the entry exists.
+_registry: Dict[Tuple[type, int], Tuple[Any, Any]] = {}
+
+def shared(cls: Type[T], config: Optional[Config] = None) -> T:
+    """Return a process-wide instance of a utility class.
+
+    Instances are shared between agents built from the same config, so
+    models and network clients are only initialized once.
+    """
+    key = (cls, id(config))
+    entry = _registry.get(key)
+    if entry is None:
+        instance = cls(config) if config is not None else cls()
+        entry = _registry[key] = (config, instance)
+    return entry[1]
+
+def clear_registry() -> None:
+    """Drop all shared instances."""
+    _registry.clear()
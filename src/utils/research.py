@@ -1,4 +1,5 @@
 from typing import Dict, List
+from .batching import AsyncBatcher
 from .config import Config
 
 class SearchAPI:
@@ -30,6 +31,20 @@ class ContentAnalyzer:
     async def analyze_sentiment(self, content: Dict) -> Dict:
         return {"score": 0.5, "key_phrases": []}
 
+    async def analyze_sentiment_batch(self, contents: List[Dict]) -> List[Dict]:
+        return [{"score": 0.5, "key_phrases": []} for _ in contents]
+
+class SentimentBatcher(AsyncBatcher):
+    """Coalesces concurrent sentiment requests into bulk analyzer calls."""
+
+    def __init__(self, analyzer: ContentAnalyzer, max_batch_size: int = 32,
+                 max_queue_time: float = 0.02):
+        super().__init__(max_batch_size, max_queue_time)
+        self.analyzer = analyzer
+
+    async def process_batch(self, batch: List[Dict]) -> List[Dict]:
+        return await self.analyzer.analyze_sentiment_batch(batch)
+
 class SourceValidator:
     def __init__(self, config: Config):
         self.config = config
@@ -1,6 +1,9 @@
 from typing import Dict, List
+import re
 from .config import Config
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
 class KeywordAnalyzer:
     def __init__(self, config: Config):
         self.config = config
@@ -26,7 +29,7 @@ class SEOOptimizer:
         return content
 
     def generate_slug(self, title: str, keyword: str) -> str:
-        return title.lower().replace(" ", "-")
+        return _SLUG_RE.sub("-", title.lower()).strip("-")
 
     async def optimize_internal_linking(self, article: Dict) -> Dict:
         return article
@@ -0,0 +1,5 @@
+_TABLE = str.maketrans({c: "_" for c in " \t\n\r"})
+
+def slugify(text: str) -> str:
+    """Lowercase text and replace whitespace with underscores for use in IDs."""
+    return text.translate(_TABLE).lower()
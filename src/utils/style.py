@@ -17,6 +17,10 @@ class StyleChecker:
         # Implement style checking logic here
         return issues
 
+    async def check_batch(self, texts: List[str], rules: Dict) -> List[List[Dict]]:
+        """Check several texts against the same style rules."""
+        return [await self.check_text(text, rules) for text in texts]
+
     async def check_tone_consistency(self, article: Dict) -> List[Dict]:
         """Check for consistent tone throughout article."""
         issues = []
@@ -1,5 +1,6 @@
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 import logging
+import string
 from pathlib import Path
 import yaml
 import jinja2
@@ -9,10 +10,37 @@ from .config import Config
 
 logger = logging.getLogger(__name__)
 
+_FORMATTER = string.Formatter()
+
+def compile_template(template: str) -> Callable[..., str]:
+    """Parse a str.format template once into a reusable render function.
+
+    Templates using positional, attribute/index, conversion or format-spec
+    fields fall back to ``template.format``.
+    """
+    parts = []
+    for literal, field, spec, conversion in _FORMATTER.parse(template):
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if not field.isidentifier() or spec or conversion:
+            return template.format
+        parts.append((field,))
+    parts = tuple(parts)
+
+    def render(**values) -> str:
+        return "".join([
+            part if part.__class__ is str else str(values[part[0]])
+            for part in parts
+        ])
+    return render
+
 class TemplateManager:
     def __init__(self, config: Optional[Config] = None):
         self.config = config
         self.templates = {}
+        self._compiled: Dict[tuple, Callable[..., str]] = {}
         self.environment = jinja2.Environment(
             loader=jinja2.FileSystemLoader("templates"),
             autoescape=True,
@@ -68,6 +96,19 @@ class TemplateManager:
             
         raise KeyError(f"Template not found: {template_name}")
 
+    def get_compiled(
+        self,
+        template_name: str,
+        agent: Optional[str] = None
+    ) -> Callable[..., str]:
+        """Get a render function for a string template, compiled once."""
+        key = (template_name, agent)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = compile_template(self.get_template(template_name, agent))
+            self._compiled[key] = compiled
+        return compiled
+
     def render_template(
         self,
         template_name: str,
@@ -174,6 +215,7 @@ class TemplateManager:
     def reload_templates(self) -> None:
         """Reload all templates."""
         self.templates = {}
+        self._compiled.clear()
         self.load_templates()
 
     def add_template(
@@ -183,6 +225,7 @@ class TemplateManager:
         agent: Optional[str] = None
     ) -> None:
         """Add a new template."""
+        self._compiled.clear()
         if agent:
             if agent not in self.templates:
                 self.templates[agent] = {}
@@ -198,6 +241,7 @@ class TemplateManager:
         agent: Optional[str] = None
     ) -> bool:
         """Remove a template."""
+        self._compiled.clear()
         try:
             if agent:
                 del self.templates[agent][template_name]
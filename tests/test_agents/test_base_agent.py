@@ -9,6 +9,7 @@ from unittest.mock import Mock, patch
 
 from src.agents.base import BaseAgent, AgentRole, Message
 from src.utils.config import Config
+from src.utils.message_queue import SPSCAsyncQueue
 
 @pytest.fixture
 def config():
@@ -74,7 +75,7 @@ def base_agent(config, mock_llm):
 @pytest.mark.asyncio
 async def test_agent_initialization(base_agent):
     assert base_agent.role == AgentRole.RESEARCHER
-    assert isinstance(base_agent.message_queue, asyncio.Queue)
+    assert isinstance(base_agent.message_queue, SPSCAsyncQueue)
     assert base_agent.running is True
 
 @pytest.mark.asyncio
@@ -119,7 +120,7 @@ async def test_process_message_control_shutdown(base_agent):
 @pytest.mark.asyncio
 async def test_send_message(base_agent):
     target_agent = Mock()
-    base_agent.agent_registry = {AgentRole.WRITER: target_agent}
+    base_agent.register_agents({AgentRole.WRITER: target_agent})
     
     message = Message(
         sender=AgentRole.RESEARCHER,
@@ -185,8 +186,8 @@ async def test_message_to_dict(base_agent):
     )
     
     message_dict = message.to_dict()
-    assert message_dict["sender"] == AgentRole.WRITER.value
-    assert message_dict["receiver"] == AgentRole.RESEARCHER.value
+    assert message_dict["sender"] == "writer"
+    assert message_dict["receiver"] == "researcher"
     assert message_dict["content"] == {"test": "data"}
     assert message_dict["message_type"] == "task"
     assert "timestamp" in message_dict
@@ -207,6 +208,22 @@ async def test_message_from_dict(base_agent):
     assert message.content == {"test": "data"}
     assert message.message_type == "task"
 
+@pytest.mark.asyncio
+async def test_message_bytes_roundtrip(base_agent):
+    message = Message(
+        sender=AgentRole.WRITER,
+        receiver=AgentRole.RESEARCHER,
+        content={"test": "data"},
+        message_type="task"
+    )
+    
+    restored = Message.from_bytes(message.to_bytes())
+    assert isinstance(message.to_bytes(), bytes)
+    assert restored.sender == AgentRole.WRITER
+    assert restored.receiver == AgentRole.RESEARCHER
+    assert restored.content == {"test": "data"}
+    assert restored.message_type == "task"
+
 @pytest.mark.asyncio
 async def test_agent_shutdown(base_agent):
     await base_agent.shutdown()
@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from src.utils.config import Config
+
+@pytest.fixture
+def config():
+    return Config({
+        "llm": {
+            "model": "gpt-4",
+            "api_key": "test-key"
+        },
+        "agents": {
+            "researcher": {"search_apis": ["google"], "max_sources": 10},
+            "writer": {"style_guide": "technical", "tone": "professional"},
+            "editor": {"grammar_checker": "default", "style_guide": "technical"},
+            "seo": {"tools": ["keyword_research"]},
+            "image": {"generator": "dall-e", "style": "modern"},
+            "publisher": {"platforms": ["wordpress"]}
+        }
+    })
+
+def test_returned_sections_do_not_stale_lookups(config):
+    config.get("agents")["writer"]["tone"] = "casual"
+    config.to_dict()["agents"]["writer"]["tone"] = "casual"
+    
+    assert config.get("agents.writer.tone") == "professional"
+    assert config.get("agents.writer")["tone"] == "professional"
+
+def test_set_updates_lookups(config):
+    config.get("agents.writer")
+    config.set("agents.writer.tone", "casual")
+    
+    assert config.get("agents.writer.tone") == "casual"
+    assert config.get("agents")["writer"]["tone"] == "casual"
@@ -131,7 +131,7 @@ async def test_process_task_edit_article(editor_agent, sample_article):
 
 @pytest.mark.asyncio
 async def test_check_grammar(editor_agent, sample_article):
-    editor_agent.grammar_checker.check_text.side_effect = [
+    editor_agent.grammar_checker.check_batch.return_value = [
         [{"type": "spelling", "message": "Error 1"}],  # For title
         [{"type": "grammar", "message": "Error 2"}],   # For introduction
         [{"type": "punctuation", "message": "Error 3"}],  # For section 1
@@ -142,15 +142,18 @@ async def test_check_grammar(editor_agent, sample_article):
     issues = await editor_agent._check_grammar(sample_article)
     
     assert len(issues) == 4
-    assert any(issue["location"] == "title" for issue in issues)
-    assert any(issue["location"] == "introduction" for issue in issues)
-    assert editor_agent.grammar_checker.check_text.call_count == 5
+    assert any(issue["location"] == ("title", None) for issue in issues)
+    assert any(issue["location"] == ("introduction", None) for issue in issues)
+    assert editor_agent.grammar_checker.check_batch.call_count == 1
 
 @pytest.mark.asyncio
 async def test_check_style(editor_agent, sample_article):
-    editor_agent.style_checker.check_text.side_effect = [
-        [{"type": "tone", "message": "Style Error 1"}],
-        [{"type": "word_choice", "message": "Style Error 2"}]
+    editor_agent.style_checker.check_text.return_value = [
+        {"type": "tone", "message": "Style Error 1"}
+    ]
+    editor_agent.style_checker.check_batch.return_value = [
+        [{"type": "word_choice", "message": "Style Error 2"}],
+        []
     ]
     
     editor_agent.style_checker.check_tone_consistency.return_value = [
@@ -200,8 +203,8 @@ async def test_check_factual_accuracy(editor_agent, sample_article):
     }
     
     editor_agent.content_analyzer.extract_facts.return_value = [
-        {"text": "Fact 1", "location": "section_0"},
-        {"text": "Fact 2", "location": "section_1"}
+        {"text": "Fact 1", "location": ("section", 0)},
+        {"text": "Fact 2", "location": ("section", 1)}
     ]
     
     issues = await editor_agent._check_factual_accuracy(sample_article, research_data)
@@ -215,15 +218,17 @@ async def test_check_factual_accuracy(editor_agent, sample_article):
 async def test_fix_grammar(editor_agent, sample_article):
     grammar_issues = [
         {
-            "location": "title",
+            "location": ("title", None),
             "description": "Spelling error",
             "severity": "high",
+            "_sev": 3,
             "auto_fix": "Fixed Title"
         },
         {
-            "location": "section_0",
+            "location": ("section", 0),
             "description": "Grammar error",
             "severity": "medium",
+            "_sev": 2,
             "auto_fix": "Fixed Section Content"
         }
     ]
@@ -238,7 +243,7 @@ async def test_fix_grammar(editor_agent, sample_article):
 async def test_fix_style(editor_agent, sample_article):
     style_issues = [
         {
-            "location": "introduction",
+            "location": ("introduction", None),
             "description": "Tone inconsistency",
             "severity": "medium",
             "suggested_fix": "Fixed Introduction"
@@ -257,13 +262,13 @@ async def test_improve_content(editor_agent, sample_article):
     content_issues = [
         {
             "type": "flow",
-            "location": "section_0",
+            "location": ("section", 0),
             "description": "Add transition",
             "suggestion": "With this in mind,"
         },
         {
             "type": "coverage",
-            "location": "section_1",
+            "location": ("section", 1),
             "description": "Expand point",
             "suggestion": "Additional content needed"
         }
@@ -277,7 +282,8 @@ async def test_improve_content(editor_agent, sample_article):
     
     improved_article = await editor_agent._improve_content(sample_article, content_issues)
     
-    assert improved_article != sample_article
+    assert improved_article["sections"][0]["content"] == "Improved Section 1"
+    assert improved_article["sections"][1]["content"] == "Improved Section 2"
     assert editor_agent._improve_section_content.call_count == 2
 
 @pytest.mark.asyncio
@@ -338,7 +344,7 @@ async def test_formatting_issues(editor_agent):
         {"message": "Error 2", "severity": "medium"}
     ]
     
-    location = "section_0"
+    location = ("section", 0)
     formatted_issues = editor_agent._format_issues(location, raw_issues)
     
     assert len(formatted_issues) == len(raw_issues)
@@ -348,18 +354,18 @@ async def test_formatting_issues(editor_agent):
 @pytest.mark.asyncio
 async def test_group_issues_by_section(editor_agent):
     issues = [
-        {"location": "title", "message": "Error 1"},
-        {"location": "section_0", "message": "Error 2"},
-        {"location": "section_0", "message": "Error 3"},
-        {"location": "conclusion", "message": "Error 4"}
+        {"location": ("title", None), "message": "Error 1"},
+        {"location": ("section", 0), "message": "Error 2"},
+        {"location": ("section", 0), "message": "Error 3"},
+        {"location": ("conclusion", None), "message": "Error 4"}
     ]
     
     grouped = editor_agent._group_issues_by_section(issues)
     
-    assert "title" in grouped
-    assert "section_0" in grouped
-    assert "conclusion" in grouped
-    assert len(grouped["section_0"]) == 2
+    assert ("title", None) in grouped
+    assert ("section", 0) in grouped
+    assert ("conclusion", None) in grouped
+    assert len(grouped[("section", 0)]) == 2
 
 @pytest.mark.asyncio
 async def test_create_editing_metadata(editor_agent):
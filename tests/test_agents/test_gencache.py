@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pytest
+
+from src.utils.gencache import StructuralCache
+
+@pytest.fixture
+def cache():
+    return StructuralCache(maxsize=8)
+
+def test_lookup_miss(cache):
+    assert cache.lookup('Write about "solar power"') is None
+
+    cache.store('Write about "solar power"', "Solar power is growing.")
+
+    # A different skeleton does not match
+    assert cache.lookup('Summarize "solar power"') is None
+    assert cache.misses == 2
+    assert cache.hits == 0
+
+def test_lookup_hit(cache):
+    prompt = 'Write about "solar power" for \'engineers\''
+    cache.store(prompt, "An overview.")
+
+    assert cache.lookup(prompt) == "An overview."
+    assert cache.hits == 1
+    assert len(cache) == 1
+
+def test_slot_substitution(cache):
+    cache.store(
+        'Write about "solar power" for \'engineers\'',
+        "Engineers should know solar power basics. Solar power scales."
+    )
+
+    result = cache.lookup('Write about "wind energy" for \'engineers\'')
+
+    assert result == "Engineers should know wind energy basics. Solar power scales."
+
+def test_short_slots_not_substituted(cache):
+    cache.store('Rate "AI" in "healthcare"', "AI helps in healthcare. SAID")
+
+    # "AI" is below the minimum slot length, so only "healthcare" is a slot
+    assert cache.lookup('Rate "ML" in "finance"') == "AI helps in finance. SAID"
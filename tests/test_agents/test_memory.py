@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pytest
+from datetime import datetime, timedelta
+
+from src.utils.config import Config
+from src.utils.memory import AgentMemory
+
+@pytest.fixture
+def config(tmp_path):
+    return Config({
+        "llm": {
+            "model": "gpt-4",
+            "api_key": "test-key"
+        },
+        "agents": {
+            "researcher": {"search_apis": ["google"], "max_sources": 10},
+            "writer": {"style_guide": "technical", "tone": "professional"},
+            "editor": {"grammar_checker": "default", "style_guide": "technical"},
+            "seo": {"tools": ["keyword_research"]},
+            "image": {"generator": "dall-e", "style": "modern"},
+            "publisher": {"platforms": ["wordpress"]}
+        },
+        "memory": {
+            "storage_path": str(tmp_path / "memory"),
+            # Keep changes in the log so reloading replays them
+            "log_compact_ratio": 1000
+        }
+    })
+
+@pytest.mark.asyncio
+async def test_recreated_pattern_survives_reload(config):
+    memory = AgentMemory("writer", config)
+    await memory.save_memory()
+    
+    seen = datetime(2024, 1, 1, 9)
+    interaction = memory._format_interaction({"task": "draft"}, seen)
+    await memory._update_patterns(interaction, seen)
+    await memory._flush()
+    pattern_ids = set(memory.patterns)
+    assert pattern_ids
+    
+    # Expire the patterns, then see the same interaction again before flushing
+    await memory._cleanup_patterns(seen + timedelta(days=60))
+    assert not memory.patterns
+    await memory._update_patterns(interaction, seen)
+    await memory._flush()
+    
+    reloaded = AgentMemory("writer", config)
+    assert memory._log_path.exists()
+    assert set(reloaded.patterns) == pattern_ids
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pytest
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.agents.base import BaseAgent, AgentRole, Message
+from src.utils.config import Config
+from src.pipeline import manager
+from src.pipeline.manager import ContentPipeline
+
+class ForwardAgent(BaseAgent):
+    """Passes the pipeline on to the next stage."""
+
+    def __init__(self, role, config):
+        super().__init__(role, config, Mock())
+
+    async def _process_task(self, message: Message):
+        return Message.acquire(
+            sender=self.role,
+            receiver=AgentRole(self.role + 1),
+            content={"pipeline_id": message.content["pipeline_id"]}
+        )
+
+class FailingAgent(ForwardAgent):
+    async def _process_task(self, message: Message):
+        raise RuntimeError("draft failed")
+
+@pytest.fixture
+def config(tmp_path):
+    return Config({
+        "llm": {
+            "model": "gpt-4",
+            "api_key": "test-key"
+        },
+        "agents": {
+            "researcher": {"search_apis": ["google"], "max_sources": 10},
+            "writer": {"style_guide": "technical", "tone": "professional"},
+            "editor": {"grammar_checker": "default", "style_guide": "technical"},
+            "seo": {"tools": ["keyword_research"]},
+            "image": {"generator": "dall-e", "style": "modern"},
+            "publisher": {"platforms": ["wordpress"]}
+        },
+        "memory": {
+            "persistent": False,
+            "storage_path": str(tmp_path / "memory")
+        },
+        "monitoring": {"logs_path": str(tmp_path / "logs")}
+    })
+
+@pytest.mark.asyncio
+async def test_later_stage_error_fails_pipeline(config):
+    agent_classes = {
+        AgentRole.RESEARCHER: lambda cfg: ForwardAgent(AgentRole.RESEARCHER, cfg),
+        AgentRole.WRITER: lambda cfg: FailingAgent(AgentRole.WRITER, cfg)
+    }
+    with patch.dict(manager._AGENT_CLASSES, agent_classes), \
+            patch.object(manager.PipelineMonitor, "track_pipeline", AsyncMock()):
+        pipeline = ContentPipeline(config)
+        try:
+            pipeline_id = await asyncio.wait_for(
+                pipeline.start_pipeline("Test Topic"),
+                timeout=5
+            )
+        finally:
+            for task in pipeline._agent_tasks:
+                task.cancel()
+            await asyncio.gather(*pipeline._agent_tasks, return_exceptions=True)
+
+    status = pipeline.pipeline_status[pipeline_id]
+    assert status["status"] == "failed"
+    assert status["errors"] == ["draft failed"]
+    assert not pipeline._active_pipelines
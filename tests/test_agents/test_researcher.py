@@ -2,9 +2,10 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+import time
 import pytest
 from unittest.mock import Mock, patch
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from src.agents.researcher import ResearchAgent
 from src.agents.base import AgentRole, Message
@@ -166,9 +167,8 @@ async def test_cache_functionality(researcher_agent):
     assert researcher_agent.search_api.search.call_count == 0
     
     # Simulate cache expiration
-    cache_key = researcher_agent._generate_cache_key("test topic")
-    researcher_agent.research_cache[cache_key]["timestamp"] = \
-        datetime.now() - timedelta(hours=25)
+    now = time.monotonic()
+    researcher_agent.research_cache.timer = lambda: now + timedelta(hours=25).total_seconds()
     
     # Third request - should perform new research
     await researcher_agent.gather_research("test topic")
@@ -208,3 +208,13 @@ async def test_deduplication(researcher_agent):
     assert len(unique_points) == 2
     assert unique_points[0]["content"] == "point1"
     assert unique_points[1]["content"] == "point2"
+    
+    # Points with missing or non-string fields are still deduplicated
+    points = [
+        {"category": None, "content": "point1"},
+        {"category": None, "content": "point1"},
+        {"category": 3, "content": 42}
+    ]
+    
+    unique_points = researcher_agent._deduplicate_points(points)
+    assert len(unique_points) == 2
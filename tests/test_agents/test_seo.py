@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import pytest
+from unittest.mock import patch
+
+from src.agents import seo
+from src.agents.seo import SEOAgent
+from src.utils.config import Config
+
+@pytest.fixture
+def config():
+    return Config({
+        "llm": {
+            "model": "gpt-4",
+            "api_key": "test-key"
+        },
+        "agents": {
+            "researcher": {"search_apis": ["google"], "max_sources": 10},
+            "writer": {"style_guide": "technical", "tone": "professional"},
+            "editor": {"grammar_checker": "default", "style_guide": "technical"},
+            "seo": {"tools": ["keyword_research"], "target_score": 80},
+            "image": {"generator": "dall-e", "style": "modern"},
+            "publisher": {"platforms": ["wordpress"]}
+        }
+    })
+
+@pytest.fixture
+def seo_agent(config):
+    return SEOAgent(config)
+
+@pytest.mark.parametrize("accelerated", [True, False])
+def test_count_keywords_overlapping(seo_agent, accelerated):
+    if accelerated and seo.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed")
+    
+    with patch.object(seo, "ahocorasick", seo.ahocorasick if accelerated else None):
+        counts = seo_agent._count_keywords("aaaa banana", ["aa", "ana", "Banana"])
+    
+    assert counts["aa"] == 3
+    assert counts["ana"] == 2
+    assert counts["banana"] == 1
@@ -189,6 +189,32 @@ async def test_write_section(writer_agent):
     assert result["type"] == "overview"
     assert "sources" in result
 
+def test_render_prompt_static_prefix(writer_agent):
+    writer_agent.style_guide.get_rules.return_value = {"tone": "formal"}
+    writer_agent.template_manager.get_template.return_value = \
+        "Style guide: {style_guide}\nWrite a title.{{DYNAMIC}}Topic: {topic}"
+    
+    first = writer_agent._render_prompt("title", {"topic": "AI"})
+    second = writer_agent._render_prompt("title", {"topic": "Robotics"})
+    
+    assert first[0] == second[0]
+    assert first[0]["cache_control"] == {"type": "ephemeral"}
+    assert '"tone": "formal"' in first[0]["text"]
+    assert first[0]["text"].endswith("Write a title.")
+    assert first[1]["text"] == "Topic: AI"
+    assert second[1]["text"] == "Topic: Robotics"
+    writer_agent.template_manager.get_template.assert_called_once_with("title")
+    
+    # Without the marker the template renders as before, with no static block
+    writer_agent.template_manager.get_template.return_value = \
+        "Outline {topic} using {style_guide}"
+    
+    blocks = writer_agent._render_prompt("outline", {"topic": "AI"})
+    
+    assert blocks == [
+        {"type": "text", "text": 'Outline AI using {"tone": "formal"}'}
+    ]
+
 @pytest.mark.asyncio
 async def test_get_section_data(writer_agent, sample_research_data):
     section = {